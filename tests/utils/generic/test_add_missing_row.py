@@ -147,3 +147,49 @@ def test_add_missing_row_index_date_error():
         )
 
     assert str(e_info.value) == "Unknown complete index type: my_date"
+
+
+def test_add_missing_row_between_unsorted_index():
+    """
+    It should add missing rows between min and max values of each group
+    with a complete index which is not sorted, without modifying the input
+    """
+    input_df = pd.DataFrame(
+        {"name": ["A", "A", "B", "B"], "month": [1, 4, 2, 3], "value": [1, 2, 3, 4]}
+    )
+    new_df = add_missing_row(
+        input_df,
+        id_cols=["name"],
+        reference_col="month",
+        complete_index=[4, 3, 2, 1, 5],
+        method="between",
+    )
+    assert new_df["name"].tolist() == ["A", "A", "A", "A", "B", "B"]
+    assert new_df["month"].tolist() == [4, 3, 2, 1, 3, 2]
+    assert new_df["value"].fillna(0).tolist() == [2, 0, 0, 1, 4, 3]
+    assert list(input_df.columns) == ["name", "month", "value"]
+
+
+def test_add_missing_row_between_and_after_sparse():
+    """
+    It should only add the rows after the min of each group, in the order of the complete index
+    """
+    input_df = pd.DataFrame({"name": ["A", "B"], "day": ["02-01", "31-12"], "value": [1, 2]})
+    complete_index = {
+        "type": "date",
+        "format": "%d-%m",
+        "start": "2019-12-30",
+        "end": "2020-01-02",
+        "freq": "D",
+    }
+    new_df = add_missing_row(
+        input_df,
+        id_cols=["name"],
+        reference_col="day",
+        complete_index=complete_index,
+        method="between_and_after",
+    )
+    # (the days are compared as strings)
+    assert new_df["name"].tolist() == ["A", "A", "A", "B"]
+    assert new_df["day"].tolist() == ["30-12", "31-12", "02-01", "31-12"]
+    assert new_df["value"].fillna(0).tolist() == [0, 0, 1, 2]
@@ -26,3 +26,28 @@ def test_combine_columns_aggregation():
     assert res.loc[mask, "value"].values[0] == 8
     mask = (res["filter1"] == "All 1") & (res["filter2"] == "C")
     assert res.loc[mask, "value"].values[0] == 8
+
+
+def test_combine_columns_aggregation_n_jobs():
+    """
+    It should aggregate the combinations in parallel for any aggregation
+    """
+    df = pd.DataFrame(
+        {
+            "year": [2017, 2017, 2017, 2018],
+            "filter1": ["A", "A", "B", "B"],
+            "filter2": ["C", "D", "C", "C"],
+            "value": [1, 5, 2, 8],
+        }
+    )
+    cols_for_combination = {"filter1": "All 1", "filter2": "All 2"}
+    res = combine_columns_aggregation(df, ["year"], cols_for_combination, "mean", n_jobs=2)
+    assert res.columns.tolist() == ["year", "value", "filter1", "filter2"]
+    assert res["value"].tolist() == [
+        *[8 / 3, 8],
+        *[3, 2, 8],
+        *[1.5, 5, 8],
+        *[1, 5, 2, 8],
+    ]
+    expected = combine_columns_aggregation(df, ["year"], cols_for_combination, "mean")
+    pd.testing.assert_frame_equal(res, expected)
@@ -6,6 +6,7 @@ import pytest
 from toucan_data_sdk.utils.generic import (
     compute_evolution_by_criteria,
     compute_evolution_by_frequency,
+    compute_evolutions_by_frequency,
 )
 from toucan_data_sdk.utils.generic.compute_evolution import DuplicateRowsError
 from toucan_data_sdk.utils.helpers import ParamsValueError
@@ -71,8 +72,10 @@ def test_compute_evolution():
 
     assert input_df["populationA-1"].equals(evolution_df["population_offseted"])
     assert input_df["evolution_pct"].equals(evolution_df["evolution_computed"])
-    assert (input_df.shape[1] + 1) == evolution_df.shape[1]
+    assert (input_df.shape[1] + 2) == evolution_df.shape[1]
     assert evolution_df["Date"].dtype == object
+    # the parsed dates are not added to the input dataframe
+    assert "_Date_copy_" not in input_df.columns
 
     evolution_df = compute_evolution_by_frequency(
         input_df,
@@ -169,4 +172,67 @@ def test_compute_evolution_by_frequency_date_dict():
 
     assert input_df["populationA-1"].equals(evolution_df["population_offseted"])
     assert input_df["evolution_pct"].equals(evolution_df["evolution_computed"])
-    assert (input_df.shape[1] + 1) == evolution_df.shape[1]
+    assert (input_df.shape[1] + 2) == evolution_df.shape[1]
+
+
+def test_compute_evolutions_by_frequency():
+    """
+    It should compute the evolutions of several columns at several frequencies
+    """
+    id_cols = ["City", "Country", "Region"]
+    input_df = pd.read_csv(os.path.join(fixtures_base_dir, "compute_evolution.csv"))
+    input_df["population_2"] = input_df["population"] * 2
+    evolution_df = compute_evolutions_by_frequency(
+        input_df,
+        id_cols=id_cols,
+        date_col={"selector": "Date", "format": "%Y-%m-%d"},
+        value_cols=["population", "population_2"],
+        freqs=[{"years": 1}, {"years": 2}],
+        method="pct",
+    )
+    assert evolution_df.columns.tolist() == input_df.columns.tolist() + [
+        f"{value_col}_{freq}{suffix}"
+        for freq in ("1years", "2years")
+        for value_col in ("population", "population_2")
+        for suffix in ("_offseted", "_evolution")
+    ]
+    for value_col in ("population", "population_2"):
+        for freq in ({"years": 1}, {"years": 2}):
+            expected = compute_evolution_by_frequency(
+                input_df,
+                id_cols=id_cols,
+                date_col={"selector": "Date", "format": "%Y-%m-%d"},
+                value_col=value_col,
+                freq=freq,
+                method="pct",
+                format="df",
+            )
+            name = f"{value_col}_{freq['years']}years"
+            assert evolution_df[f"{name}_offseted"].equals(expected[f"{value_col}_offseted"])
+            assert evolution_df[f"{name}_evolution"].equals(expected["evolution_computed"])
+    assert input_df["evolution_pct"].equals(evolution_df["population_1years_evolution"])
+
+    with pytest.raises(DuplicateRowsError):
+        compute_evolutions_by_frequency(
+            input_df, ["Country"], "Year", value_cols=["population"], freqs={"yoy": 1}
+        )
+
+
+def test_compute_evolutions_by_frequency_offset_names():
+    """
+    The frequencies given as DateOffset are named like the equivalent dicts
+    """
+    input_df = pd.read_csv(os.path.join(fixtures_base_dir, "compute_evolution.csv"))
+    evolution_df = compute_evolutions_by_frequency(
+        input_df,
+        id_cols=["City", "Country", "Region"],
+        date_col={"selector": "Date", "format": "%Y-%m-%d"},
+        value_cols=["population"],
+        freqs=[pd.DateOffset(years=1), pd.DateOffset(months=3, n=2), pd.offsets.Day(2)],
+    )
+    assert evolution_df.columns.tolist() == input_df.columns.tolist() + [
+        f"population_{freq}{suffix}"
+        for freq in ("1years", "6months", "2D")
+        for suffix in ("_offseted", "_evolution")
+    ]
+    assert evolution_df["population_1years_evolution"].equals(input_df["evolution"])
@@ -44,3 +44,22 @@ def test_drop_levels():
         drop_levels=["Region"],
     )
     assert "Region" not in res_df.Type.unique()
+
+
+def test_roll_up_missing_lower_level():
+    """
+    It should aggregate the rows without a value for the lower levels in the upper levels
+    """
+    input_df = pd.DataFrame(
+        {
+            "Region": ["Idf", "Idf", "Idf", "Nord"],
+            "City": ["Paris", "Paris", None, "Lille"],
+            "Population": [100, 50, 20, 10],
+        }
+    )
+    res_df = roll_up(
+        input_df, levels=["Region", "City"], groupby_vars="Population", agg_func="count"
+    )
+    assert res_df["value"].tolist() == ["Paris", "Lille", "Idf", "Nord"]
+    assert res_df["Population"].tolist() == [2, 1, 3, 1]
+    assert res_df["parent"].fillna("").tolist() == ["Idf", "Nord", "", ""]
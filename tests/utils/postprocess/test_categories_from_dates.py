@@ -1,5 +1,6 @@
 from datetime import date, timedelta
 
+import numpy as np
 import pandas as pd
 import pytest
 from pandas.testing import assert_frame_equal
@@ -64,19 +65,23 @@ def test_categories_from_dates(sample_data):
         df, "date", "my_categories", range_steps=["2018-01-31", "2018-02-03"]
     )
     expected = df.copy()
-    expected["my_categories"] = [
-        "Category 1",
-        "Category 1",
-        "Category 1",
-        "Category 1",
-        "Category 2",
-        "Category 2",
-        "Category 2",
-        "Category 3",
-        "Category 3",
-        "Category 3",
-        "Category 3",
-    ]
+    expected["my_categories"] = pd.Categorical(
+        [
+            "Category 1",
+            "Category 1",
+            "Category 1",
+            "Category 1",
+            "Category 2",
+            "Category 2",
+            "Category 2",
+            "Category 3",
+            "Category 3",
+            "Category 3",
+            "Category 3",
+        ],
+        categories=["Category 1", "Category 2", "Category 3"],
+        ordered=True,
+    )
     assert_frame_equal(df, expected)
 
 
@@ -84,19 +89,23 @@ def test_categories_from_dates_with_offset(sample_data):
     """It should create a new column 'my_categories'"""
     df = pd.DataFrame(sample_data)
     expected = df.copy()
-    expected["my_categories"] = [
-        "Category 1",
-        "Category 1",
-        "Category 1",
-        "Category 1",
-        "Category 1",
-        "Category 1",
-        "Category 1",
-        "Category 2",
-        "Category 3",
-        "Category 3",
-        "Category 2",
-    ]
+    expected["my_categories"] = pd.Categorical(
+        [
+            "Category 1",
+            "Category 1",
+            "Category 1",
+            "Category 1",
+            "Category 1",
+            "Category 1",
+            "Category 1",
+            "Category 2",
+            "Category 3",
+            "Category 3",
+            "Category 2",
+        ],
+        categories=["Category 1", "Category 2", "Category 3"],
+        ordered=True,
+    )
     df = categories_from_dates(df, "date", "my_categories", range_steps=["(TODAY)-10days", "TODAY"])
     assert_frame_equal(df, expected)
 
@@ -105,19 +114,23 @@ def test_categories_from_dates_with_category_names(sample_data):
     """It should create a new column 'my_categories'"""
     df = pd.DataFrame(sample_data)
     expected = df.copy()
-    expected["my_categories"] = [
-        "Old",
-        "Old",
-        "Old",
-        "Old",
-        "Old",
-        "Old",
-        "Old",
-        "Recent",
-        "Recent",
-        "Futur",
-        "Recent",
-    ]
+    expected["my_categories"] = pd.Categorical(
+        [
+            "Old",
+            "Old",
+            "Old",
+            "Old",
+            "Old",
+            "Old",
+            "Old",
+            "Recent",
+            "Recent",
+            "Futur",
+            "Recent",
+        ],
+        categories=["Old", "Recent", "Futur"],
+        ordered=True,
+    )
     df = categories_from_dates(
         df,
         "date",
@@ -126,3 +139,17 @@ def test_categories_from_dates_with_category_names(sample_data):
         category_names=["Old", "Recent", "Futur"],
     )
     assert_frame_equal(df, expected)
+
+
+def test_categories_from_dates_unsorted_steps_and_missing_dates():
+    df = pd.DataFrame({"date": ["2018-01-01", "2018-01-15", None, "2018-02-15", "2018-03-15"]})
+    df = categories_from_dates(
+        df,
+        "date",
+        "my_categories",
+        range_steps=["2018-02-01", "2018-01-10", "2018-03-01"],
+        category_names=["A", "B", "A", "C"],
+    )
+    assert df["my_categories"].cat.categories.tolist() == ["A", "B", "C"]
+    # a category overwrites the previous ones
+    assert df["my_categories"].tolist() == ["A", "A", np.nan, "A", "C"]
@@ -0,0 +1,100 @@
+import copy
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import toucan_data_sdk.utils.postprocess as postprocess_functions
+from toucan_data_sdk.utils.postprocess.compiler import (
+    FusedStage,
+    apply_postprocess,
+    compile_postprocess,
+)
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {
+            "country": ["France", "germany", "France", "spain"],
+            "city": [" Paris", "Munich ", "Nice", "Madrid"],
+            "value": [1.0, np.nan, 3.0, 4.0],
+            "total": [10, 20, 30, 40],
+        },
+        index=[0, 0, 1, 2],  # non unique index
+    )
+
+
+def _apply_sequentially(df, steps):
+    for step in copy.deepcopy(steps):
+        func = getattr(postprocess_functions, step.pop("postprocess"))
+        df = func(df, **step)
+    return df
+
+
+STEPS = [
+    {"postprocess": "fillna", "column": "value", "value": 0},
+    {"postprocess": "formula", "new_column": "ratio", "formula": "`value` / `total`"},
+    {"postprocess": "multiply", "new_column": "ratio", "column_1": "ratio", "column_2": 100},
+    {"postprocess": "upper", "column": "country"},
+    {"postprocess": "strip", "column": "city", "new_column": "clean_city"},
+    {"postprocess": "concat", "columns": ["country", "clean_city"], "new_column": "label"},
+    {"postprocess": "replace", "column": "country", "to_replace": {"SPAIN": "ESPAÑA"}},
+    {"postprocess": "round_values", "column": "ratio", "decimals": 1},
+    {"postprocess": "query", "query": "total > 10"},
+    {"postprocess": "length", "column": "label", "new_column": "label_length"},
+]
+
+
+def test_compile_postprocess_fusion(df):
+    plan = compile_postprocess(STEPS)
+    assert [type(stage) for stage in plan.stages] == [FusedStage, type(plan.stages[1]), FusedStage]
+    assert len(plan.stages[0].operations) == 8
+    assert plan.explain().splitlines()[1] == "2. query"
+
+    expected = _apply_sequentially(df.copy(), STEPS)
+    pd.testing.assert_frame_equal(plan(df.copy()), expected)
+    pd.testing.assert_frame_equal(apply_postprocess(df.copy(), STEPS), expected)
+    # the steps are not modified
+    assert STEPS[0]["postprocess"] == "fillna"
+
+
+def test_compile_postprocess_keeps_input(df):
+    original = df.copy()
+    res = apply_postprocess(df, STEPS[:8])  # a single fused stage
+    pd.testing.assert_frame_equal(df, original)
+    assert res["country"].tolist() == ["FRANCE", "GERMANY", "FRANCE", "ESPAÑA"]
+
+
+def test_compile_postprocess_dead_columns(df):
+    steps = [
+        # overwritten before being read
+        {"postprocess": "formula", "new_column": "tmp", "formula": "`value` * 2"},
+        {"postprocess": "formula", "new_column": "tmp", "formula": "`total` * 2"},
+        # not used by the groupby
+        {"postprocess": "lower", "column": "city"},
+        {"postprocess": "fillna", "column": "value", "value": 0},
+        {"postprocess": "groupby", "group_cols": "country", "aggregations": {"tmp": "sum"}},
+    ]
+    plan = compile_postprocess(steps)
+    assert [str(operation) for operation in plan.stages[0].operations] == ["formula(total) -> tmp"]
+    pd.testing.assert_frame_equal(plan(df.copy()), _apply_sequentially(df.copy(), steps))
+
+
+def test_compile_postprocess_columns_order(df):
+    steps = [
+        {"postprocess": "formula", "new_column": "tmp", "formula": "`value` * 2"},  # skipped
+        {"postprocess": "formula", "new_column": "ratio", "formula": "`value` / `total`"},
+        {"postprocess": "formula", "new_column": "tmp", "formula": "`total` * 2"},
+        {"postprocess": "upper", "column": "country"},
+    ]
+    plan = compile_postprocess(steps)
+    assert len(plan.stages[0].operations) == 3
+    res = plan(df.copy())
+    assert res.columns.tolist() == ["country", "city", "value", "total", "tmp", "ratio"]
+    pd.testing.assert_frame_equal(res, _apply_sequentially(df.copy(), steps))
+
+
+def test_compile_postprocess_errors():
+    with pytest.raises(ValueError, match="Unknown postprocess"):
+        compile_postprocess([{"postprocess": "nope"}])
@@ -167,6 +167,30 @@ def test_filter_by_date_range(sample_data):
     assert_frame_equal_noindex(df, expected)
 
 
+def test_filter_by_date_sorted_dates(sample_data):
+    """It should give the same result on sorted dates and on a DatetimeIndex"""
+    df = pd.DataFrame(sample_data[:7])
+    df["date"] = pd.to_datetime(df["date"])
+    df_with_index = df.set_index("date")
+    for params, expected_values in [
+        ({"start": "2018-01-29", "stop": "2018-02-01"}, [2, 3, 4]),
+        ({"atdate": "2018-01-28"}, [0, 1]),
+        ({"start": "2018-02-01"}, [5, 6]),
+        ({"stop": "2018-01-29"}, [0, 1]),
+        ({"start": "2018-02-01", "stop": "2018-01-29"}, []),
+    ]:
+        result = filter_by_date(df, "date", **params)
+        assert result["value"].tolist() == expected_values
+        assert result.index.tolist() == expected_values
+        result = filter_by_date(df_with_index, "date", **params)
+        assert result["value"].tolist() == expected_values
+        assert result.index.tolist() == df.loc[expected_values, "date"].tolist()
+    # the result is a copy
+    result = filter_by_date(df, "date", atdate="2018-01-28")
+    result.loc[0, "value"] = 10
+    assert df.loc[0, "value"] == 0
+
+
 def test_filter_by_date_range_with_offsets(sample_data):
     """It should keep rows on a specific range with offsets"""
     df = pd.DataFrame(sample_data)
@@ -1,6 +1,7 @@
 import pandas as pd
 import pytest
 
+from toucan_data_sdk.utils import postprocess
 from toucan_data_sdk.utils.postprocess import if_else
 
 rows1 = [
@@ -82,3 +83,62 @@ def test_if_else_missing_args() -> None:
 
     with pytest.raises(ValueError, match="then"):
         if_else(df, new_column="coucou", **{"if": "a"})
+
+
+def test_if_else_keeps_lines_order():
+    df = pd.DataFrame({"a": [3, 1, 2, 0], "b": [1.0, 2.0, 3.0, 4.0]}, index=[3, 1, 2, 0])
+    res = if_else(df, **{"if": "a >= 2", "then": 1, "else": None, "new_column": "new"})
+    assert res.index.tolist() == [3, 1, 2, 0]
+    assert res["new"].tolist() == [1, None, 1, None]
+
+    config = {
+        "if": "a >= 2",
+        "then": {"postprocess": "formula", "formula": "a + b"},
+        "else": "low",
+        "new_column": "new",
+    }
+    res = if_else(df, **config)
+    assert res.index.tolist() == [3, 1, 2, 0]
+    assert res["new"].tolist() == [4.0, "low", 5.0, "low"]
+    # the postprocess steps are not modified
+    assert config["then"] == {"postprocess": "formula", "formula": "a + b"}
+
+
+def test_if_else_keeps_duplicated_index(monkeypatch):
+    df = pd.DataFrame({"a": [3, 1, 2, 0]}, index=["x", "y", "x", "y"])
+
+    # simple values
+    res = if_else(df, **{"if": "a >= 2", "then": "high", "else": "low", "new_column": "new"})
+    assert res.index.tolist() == ["x", "y", "x", "y"]
+    assert res["new"].tolist() == ["high", "low", "high", "low"]
+
+    # postprocesses keeping the lines
+    config = {
+        "if": "a >= 2",
+        "then": {"postprocess": "formula", "formula": "`a` * 2"},
+        "else": "low",
+        "new_column": "new",
+    }
+    res = if_else(df, **config)
+    assert res.index.tolist() == ["x", "y", "x", "y"]
+    assert res["new"].tolist() == [6, "low", 4, "low"]
+
+    # postprocesses dropping and reordering the lines
+    def drop_first_and_reverse(df, new_column):
+        return df.iloc[1:][::-1].assign(**{new_column: "high"})
+
+    monkeypatch.setattr(
+        postprocess, "drop_first_and_reverse", drop_first_and_reverse, raising=False
+    )
+    config = {
+        "if": "a >= 1",
+        "then": {"postprocess": "drop_first_and_reverse"},
+        "else": "low",
+        "new_column": "new",
+    }
+    res = if_else(df, **config)
+    assert res.index.tolist() == ["y", "x", "y"]
+    assert res["a"].tolist() == [1, 2, 0]
+    assert res["new"].tolist() == ["high", "high", "low"]
+    # the input dataframe is not modified
+    assert df.index.tolist() == ["x", "y", "x", "y"]
@@ -0,0 +1,95 @@
+import copy
+
+import pandas as pd
+import pytest
+
+import toucan_data_sdk.utils.postprocess as postprocess_functions
+from toucan_data_sdk.utils.postprocess.lazy import LazyFrame
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {
+            "country": ["france", "spain", "france", "italy"],
+            "date": ["2017-05-01", "2018-02-01", "2018-03-01", "2018-04-01"],
+            "value": [1.0, 2.0, 3.0, 4.0],
+            "total": [10, 20, 30, 40],
+            "unused": [0, 0, 0, 0],
+        },
+        index=[0, 0, 1, 2],  # non unique index
+    )
+
+
+def _apply_sequentially(df, steps):
+    for step in copy.deepcopy(steps):
+        func = getattr(postprocess_functions, step.pop("postprocess"))
+        df = func(df, **step)
+    return df
+
+
+STEPS = [
+    {"postprocess": "upper", "column": "country"},
+    {"postprocess": "formula", "new_column": "ratio", "formula": "`value` / `total`"},
+    {"postprocess": "concat", "columns": ["country", "date"], "new_column": "label"},
+    {"postprocess": "filter_by_date", "date_col": "date", "start": "2018-01-01"},
+    {"postprocess": "query", "query": "country != 'SPAIN' and value > 1"},
+]
+
+
+def test_lazy_frame_predicate_pushdown(df):
+    lazy_df = LazyFrame(df).apply(STEPS)
+    assert lazy_df.explain().splitlines() == [
+        # the filter on `date` can't be applied before `concat`, which reads whole columns
+        "1. fused: upper(country) -> country | formula(value, total) -> ratio"
+        " | concat(country, date) -> label",
+        "2. filter_by_date",
+        "3. query",
+    ]
+    lazy_df = LazyFrame(df).apply([STEPS[1], STEPS[0], *STEPS[3:]])
+    assert lazy_df.explain().splitlines() == [
+        "1. filter_by_date",
+        "2. fused: formula(value, total) -> ratio | upper(country) -> country",
+        "3. query",
+    ]
+
+    expected = _apply_sequentially(df.copy(), STEPS)
+    pd.testing.assert_frame_equal(LazyFrame(df.copy()).apply(STEPS).collect(), expected)
+    pd.testing.assert_frame_equal(
+        lazy_df.collect(), _apply_sequentially(df.copy(), [STEPS[1], STEPS[0], *STEPS[3:]])
+    )
+    # nothing is executed before `collect` and the source dataframe is not modified
+    assert df.columns.tolist() == ["country", "date", "value", "total", "unused"]
+
+
+def test_lazy_frame_projection_pushdown(df):
+    lazy_df = (
+        LazyFrame(df)
+        .formula(new_column="ratio", formula="`value` / `total`")
+        .query(query="`country` == 'france'")
+        .groupby(group_cols="country", aggregations={"ratio": "sum"})
+    )
+    plan = lazy_df._optimize()
+    assert plan.stages[0].name == "select"
+    assert plan.stages[0].params == {"columns": ["country", "value", "total"]}
+    assert [str(stage) for stage in plan.stages[1:]] == [
+        "query",
+        "fused: formula(value, total) -> ratio",
+        "groupby",
+    ]
+    pd.testing.assert_frame_equal(
+        lazy_df.collect(),
+        pd.DataFrame({"country": ["france"], "ratio": [0.2]}),
+    )
+
+    result = LazyFrame(df).select(["country", "value"]).query(query="value > 2").collect()
+    assert result.columns.tolist() == ["country", "value"]
+    assert result.value.tolist() == [3.0, 4.0]
+    assert "select" not in LazyFrame(df).sort(columns="value").explain()
+
+
+def test_lazy_frame_errors(df):
+    with pytest.raises(AttributeError):
+        LazyFrame(df).nope(column="value")
+    with pytest.raises(KeyError):
+        LazyFrame(df).select(["nope"]).collect()
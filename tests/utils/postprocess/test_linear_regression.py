@@ -1,4 +1,5 @@
 import pandas as pd
+import pytest
 
 from toucan_data_sdk.utils.postprocess.linear_regression import predict_linear
 
@@ -77,3 +78,33 @@ def test_predict_linear():
         "02-2021",
         "03-2021",
     ]
+
+
+def test_predict_linear_group_cols():
+    """
+    check that a regression is computed for each group
+    """
+    test_df = pd.DataFrame(
+        {
+            "country": ["France"] * 4 + ["Spain"] * 4,
+            "date": ["01-01-2020", "02-01-2020", "03-01-2020", "05-01-2020"] * 2,
+            "value": [1.0, 2.0, 3.0, None, 10.0, 8.0, None, 2.0],
+        }
+    )
+    result = predict_linear(
+        test_df, variable_column="date", target_column="value", group_cols="country"
+    )
+    assert result.columns.tolist() == [
+        "country",
+        "date",
+        "value",
+        "value_is_prediction",
+        "value_lower_bound",
+        "value_higher_bound",
+    ]
+    predicted = result[result["value_is_prediction"]]
+    assert predicted["country"].tolist() == ["France", "Spain"]
+    assert predicted["date"].tolist() == ["05-01-2020", "03-01-2020"]
+    assert predicted["value"].tolist() == pytest.approx([5.0, 6.0])
+    # the values are on the regression lines
+    assert predicted["value_lower_bound"].tolist() == pytest.approx([5.0, 6.0])
@@ -315,3 +315,23 @@ def test_round_values():
 def test_absolute_values():
     df = absolute_values(data.copy(), column="VALUE_1")
     assert df["VALUE_1"].tolist() == [1.563, 0.423, 0, 1.612]
+
+
+def test_formula_compiled():
+    df = pd.DataFrame({"a": [1, 3], "b": [2.0, 4.0], "s": ["x", "y"]})
+
+    res = formula(df.copy(), new_column="c", formula="-(`a` + `b` * 2) / (`a` - 1) - 1")
+    assert res["c"].tolist() == [float("-inf"), -6.5]
+    assert res["a"].tolist() == [1, 3]
+
+    res = formula(df.copy(), new_column="c", formula="`a`")
+    res["c"] += 1
+    assert res["a"].tolist() == [1, 3]
+
+    res = formula(df.copy(), new_column="c", formula="`s` * 2 + `s`")
+    assert res["c"].tolist() == ["xxx", "yyy"]
+
+    # only numbers, columns and arithmetic operators can be used
+    for invalid_formula in ("`a` `b`", "2(`a`)", "`a` + inf", "..."):
+        with pytest.raises(FormulaError, match="not a valid formula"):
+            formula(df.copy(), new_column="c", formula=invalid_formula)
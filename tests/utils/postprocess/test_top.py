@@ -137,3 +137,21 @@ def test_top_group():
     }
     df = top_group(data, **kwargs)
     assert df.equals(expected)
+
+
+def test_top_with_group_nulls_and_ties():
+    """It should keep ties in order of appearance, put nulls last and drop null groups"""
+    data = pd.DataFrame(
+        {
+            "group": ["a", "b", "a", None, "a", "b", "a"],
+            "value": [1.0, 2.0, None, 5.0, 1.0, 3.0, 4.0],
+            "id": [0, 1, 2, 3, 4, 5, 6],
+        },
+        index=[0, 0, 1, 1, 2, 2, 3],  # non unique index
+    )
+    df = top(data, value="value", limit=3, group="group")
+    assert df["group"].tolist() == ["a", "a", "a", "b", "b"]
+    assert df["id"].tolist() == [0, 4, 6, 1, 5]
+
+    df = top(data, value="value", limit=-3, order="desc", group="group")
+    assert df["id"].tolist() == [6, 4, 0, 5, 1]
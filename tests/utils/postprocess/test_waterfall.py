@@ -1101,3 +1101,35 @@ def test_waterfall_upperGroup_only(sample_data):
     assert wa[0].keys() == expected[0].keys()
     for i in range(len(expected)):
         testing.assert_equal(wa[i], expected[i])
+
+
+def test_waterfall_filter_missing_period():
+    """It should compute each waterfall even if a period is missing for some filters"""
+    df = pd.DataFrame(
+        {
+            "product_id": ["tac", "tac", "bom", "tac"],
+            "date": ["t1", "t2", "t2", "t2"],
+            "played": [1, 3, 5, 10],
+            "store": ["B", "B", "A", "A"],
+        }
+    )
+    kwargs = {
+        "upperGroup": {"id": "product_id"},
+        "filters": "store",
+        "date": "date",
+        "value": "played",
+        "start": {"label": "Trimestre 1", "id": "t1"},
+        "end": {"label": "Trimester 2", "id": "t2"},
+    }
+    df = waterfall(df, **kwargs)
+    assert df["store"].tolist() == ["B", "B", "B", "A", "A", "A", "A"]
+    assert df["groups"].tolist() == [
+        "Trimestre 1",
+        "tac",
+        "Trimester 2",
+        "Trimestre 1",
+        "bom",
+        "tac",
+        "Trimester 2",
+    ]
+    assert df["value"].tolist() == [1, 2, 3, 0, 5, 10, 15]
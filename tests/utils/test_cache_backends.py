@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from toucan_data_sdk.utils.cache_backends import (
+    COLUMNAR_BACKEND,
+    FEATHER_FILENAME,
+    ColumnarStoreBackend,
+)
+from toucan_data_sdk.utils.decorators import cache as etl_cache, setup_cachedir
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture
+def cachedir():
+    cachedir = tempfile.mkdtemp(prefix="pytest_cache")
+    yield cachedir
+    shutil.rmtree(cachedir)
+
+
+@pytest.fixture
+def store_backend(cachedir):
+    store_backend = ColumnarStoreBackend()
+    store_backend.configure(cachedir, verbose=0)
+    return store_backend
+
+
+@pytest.fixture
+def cache(cachedir):
+    setup_cachedir(cachedir, backend=COLUMNAR_BACKEND)
+    yield etl_cache
+    del etl_cache.memories
+
+
+def test_columnar_store_dataframe(store_backend):
+    df = pd.DataFrame(
+        {"a": [1, 2, 3], "b": ["x", "y", "z"], "c": pd.to_datetime(["2018", "2019", "2020"])},
+        index=pd.Index(["i", "j", "k"], name="idx"),
+    )
+    store_backend.dump_item(["f", "1"], df)
+
+    assert store_backend.contains_item(["f", "1"])
+    assert os.path.exists(os.path.join(store_backend.location, "f", "1", FEATHER_FILENAME))
+    pd.testing.assert_frame_equal(store_backend.load_item(["f", "1"]), df)
+
+
+@pytest.mark.parametrize(
+    "item",
+    [
+        {"not": "a dataframe"},
+        pd.DataFrame({1: [1, 2]}),  # non string column name
+        pd.DataFrame({"a": [1, "b"]}),  # mixed types
+        pd.DataFrame({"a": [[1, 2], [3]]}),  # lists (would come back as arrays)
+        pd.DataFrame({"a": ["x", np.nan]}),  # NaN in strings (would come back as None)
+    ],
+)
+def test_columnar_store_pickle_fallback(store_backend, item):
+    store_backend.dump_item(["f", "1"], item)
+
+    assert store_backend.contains_item(["f", "1"])
+    assert not os.path.exists(os.path.join(store_backend.location, "f", "1", FEATHER_FILENAME))
+    loaded = store_backend.load_item(["f", "1"])
+    if isinstance(item, pd.DataFrame):
+        pd.testing.assert_frame_equal(loaded, item)
+    else:
+        assert loaded == item
+
+
+def test_columnar_store_mmap(cachedir):
+    store_backend = ColumnarStoreBackend()
+    store_backend.configure(cachedir, verbose=0, backend_options={"mmap_mode": "r"})
+    df = pd.DataFrame({"a": [1.0, 2.0, 3.0], "b": [4, 5, 6]})
+    store_backend.dump_item(["f", "1"], df)
+    pd.testing.assert_frame_equal(store_backend.load_item(["f", "1"]), df)
+
+
+def test_cache_columnar_backend(cache):
+    calls = []
+
+    @cache()
+    def foo(x):
+        calls.append(x)
+        return pd.DataFrame({"x": [x] * 3})
+
+    pd.testing.assert_frame_equal(foo(1), foo(1))
+    assert calls == [1]
+
+
+def test_columnar_backend_without_pyarrow(mocker, cachedir):
+    mocker.patch("toucan_data_sdk.utils.cache_backends.pa", None)
+    with pytest.raises(ImportError, match=r"toucan_data_sdk\[columnar\]"):
+        setup_cachedir(cachedir, backend=COLUMNAR_BACKEND)
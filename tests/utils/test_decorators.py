@@ -2,12 +2,17 @@ import pandas as pd
 import pytest
 
 from toucan_data_sdk.utils.decorators import (
+    MemoryBudgetError,
     _logger as catch_logger,
     domain,
     log,
+    log_memory,
     log_message,
     log_shapes,
     log_time,
+    memory_profiles,
+    memory_profiles_report,
+    run_concurrently,
 )
 
 
@@ -116,3 +121,102 @@ def test_domain():
 
     with pytest.raises(TypeError):
         process_domain1(42)
+
+
+def test_log_memory(mocker):
+    logger = mocker.MagicMock()
+
+    @log_memory(logger)
+    def inner(df):
+        return pd.concat([df] * 10)
+
+    @log_memory(logger)
+    def foo(df):
+        big = inner(df)
+        return big.head(1)
+
+    df = pd.DataFrame({"values": range(10_000)})
+    foo(df)
+    assert logger.info.call_count == 2
+    args = logger.info.call_args[0]
+    assert "foo - memory" in args[0]
+
+    profiles = memory_profiles()
+    assert profiles["inner"].input_bytes == df.memory_usage(deep=True).sum()
+    assert profiles["inner"].output_bytes > 9 * profiles["inner"].input_bytes
+    assert profiles["inner"].allocated_peak > 0
+    # the allocations of the nested call are taken into account
+    assert profiles["foo"].allocated_peak >= profiles["inner"].allocated_peak
+    assert profiles["foo"].amplification > 9
+    report = memory_profiles_report()
+    assert report.index("foo") < report.index("inner")
+
+
+def test_log_memory_budget(mocker):
+    logger = mocker.MagicMock()
+
+    @log_memory(logger, budget=1000)
+    def foo(df):
+        return pd.concat([df] * 10)
+
+    df = pd.DataFrame({"values": range(10_000)})
+    foo(df)
+    logger.warning.assert_called_once()
+    assert "budget" in logger.warning.call_args[0][0]
+
+    @log_memory(logger, budget=1000, raise_over_budget=True)
+    def bar(df):
+        return pd.concat([df] * 10)
+
+    with pytest.raises(MemoryBudgetError):
+        bar(df)
+
+
+def test_domain_in_place():
+    @domain("domain1")
+    def process_domain1(df, factor=2):
+        return df * factor
+
+    df2 = pd.DataFrame({"y": [1]})
+    dfs = {"domain1": pd.DataFrame({"x": [1, 2, 3]}), "domain2": df2}
+    result = process_domain1(dfs, factor=3)
+    # the caller's dict is updated, the other domains are untouched
+    assert result is dfs
+    assert list(dfs) == ["domain1", "domain2"]
+    assert list(dfs["domain1"].x) == [3, 6, 9]
+    assert dfs["domain2"] is df2
+
+
+def test_domain_multiple():
+    @domain("domain1", "domain2")
+    def merge_domains(df1, df2):
+        return df1.assign(y=df2.y), df2.head(0)
+
+    dfs = {"domain1": pd.DataFrame({"x": [1, 2]}), "domain2": pd.DataFrame({"y": [3, 4]})}
+    merge_domains(dfs)
+    assert dfs["domain1"].to_dict("list") == {"x": [1, 2], "y": [3, 4]}
+    assert dfs["domain2"].empty
+    assert merge_domains.domains == ("domain1", "domain2")
+
+    with pytest.raises(TypeError):
+        domain()
+
+
+def test_run_concurrently():
+    @domain("domain1")
+    def process_domain1(df):
+        return df + 1
+
+    @domain("domain2", "domain3")
+    def process_domains(df2, df3):
+        return df2 * 2, df3 * 3
+
+    dfs = {name: pd.DataFrame({"x": [1]}) for name in ["domain1", "domain2", "domain3"]}
+    assert run_concurrently(dfs, process_domain1, process_domains, max_workers=2) is dfs
+    assert [dfs[name].x[0] for name in ["domain1", "domain2", "domain3"]] == [2, 2, 3]
+
+    with pytest.raises(ValueError):
+        run_concurrently(dfs, process_domain1, process_domain1)
+
+    with pytest.raises(TypeError):
+        run_concurrently(dfs, lambda dfs: dfs)
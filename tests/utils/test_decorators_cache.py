@@ -1,16 +1,30 @@
+import os
 import random
 import shutil
+import socket
 import tempfile
 import time
+from threading import Event, Thread, current_thread
 
+import joblib
+import pandas as pd
 import pytest
+from joblib._store_backends import FileSystemStoreBackend
 
 from toucan_data_sdk.utils.decorators import (
+    _CacheItemLock,
+    _logger as cache_logger,
     cache as etl_cache,
+    cache_stats,
+    cache_stats_report,
+    flush_cache_writes,
     method_cache,
+    reset_cache_stats,
     setup_cachedir,
 )
 
+dump_item = FileSystemStoreBackend.dump_item
+
 
 @pytest.fixture
 def cache():
@@ -137,3 +151,190 @@ def test_cache_on_method(cache):
     foo = Foo()
 
     assert foo.compute(42) == foo.compute(42)
+
+
+def test_cache_stats(cache):
+    reset_cache_stats()
+
+    @cache()
+    def foo_stats(x):
+        return x * 2
+
+    assert foo_stats(1) == 2
+    assert foo_stats(1) == 2
+    assert foo_stats(2) == 4
+
+    stats = cache.stats()["foo_stats"]
+    assert stats == cache_stats()["foo_stats"]
+    assert (stats.hits, stats.misses, stats.calls) == (1, 2, 3)
+    assert stats.hit_ratio == pytest.approx(1 / 3)
+    assert stats.hash_time > 0
+    assert stats.load_time > 0
+    assert stats.compute_time > 0
+    assert stats.stored_bytes > 0
+
+    report = cache_stats_report()
+    assert "foo_stats" in report
+    assert "hit ratio" in report
+
+    reset_cache_stats()
+    assert cache.stats() == {}
+
+
+def test_cache_load_failure(cache, mocker):
+    """A cached result which can't be loaded is computed again"""
+    reset_cache_stats()
+
+    @cache()
+    def foo_load_failure(x):
+        return x + random.random()
+
+    run_1 = foo_load_failure(1)
+    mocker.patch("joblib._store_backends.FileSystemStoreBackend.load_item", side_effect=ValueError)
+    assert foo_load_failure(1) != run_1
+    assert cache.stats()["foo_load_failure"].misses == 2
+
+
+def test_cache_stats_disabled(cache):
+    reset_cache_stats()
+
+    @cache(disabled=True)
+    def foo_disabled():
+        return 1
+
+    foo_disabled()
+    assert "foo_disabled" not in cache.stats()
+
+
+def test_cache_write_behind(cache, mocker):
+    reset_cache_stats()
+
+    @cache(write_behind=True)
+    def foo_write_behind(x):
+        return x + random.random()
+
+    store_backend_dump = mocker.patch(
+        "joblib._store_backends.FileSystemStoreBackend.dump_item",
+        side_effect=lambda *args, **kwargs: time.sleep(0.1) or dump_item(*args, **kwargs),
+        autospec=True,
+    )
+    run_1 = foo_write_behind(1)
+    # still being written: the second call waits for it and reads the stored result
+    assert foo_write_behind(1) == run_1
+    flush_cache_writes()
+
+    store_backend_dump.assert_called_once()
+    stats = cache.stats()["foo_write_behind"]
+    assert (stats.hits, stats.misses) == (1, 1)
+    assert stats.stored_bytes > 0
+
+
+def test_cache_write_behind_modified_input(cache, mocker):
+    """The result is stored under the arguments it was computed from, even if they are
+    modified before the writer thread persists it"""
+
+    @cache(write_behind=True)
+    def blocking_write_behind(x):
+        return x
+
+    @cache(write_behind=True)
+    def sum_write_behind(df):
+        return int(df["x"].sum())
+
+    # the writer thread is kept busy until the input is modified
+    written = Event()
+    mocker.patch(
+        "joblib._store_backends.FileSystemStoreBackend.dump_item",
+        side_effect=lambda *args, **kwargs: written.wait(5) and dump_item(*args, **kwargs),
+        autospec=True,
+    )
+    blocking_write_behind(1)
+    df = pd.DataFrame({"x": [1, 2, 3]})
+    assert sum_write_behind(df) == 6
+    df["x"] *= 10
+    written.set()
+    flush_cache_writes()
+
+    assert sum_write_behind(df) == 60
+    assert sum_write_behind(pd.DataFrame({"x": [1, 2, 3]})) == 6
+
+
+def test_cache_stampede_protection(cache):
+    """Only one of the concurrent calls computes the result, the other one waits for it"""
+    cachedir = cache.memories[current_thread().name].location
+    calls = []
+
+    @cache(lock_timeout=10)
+    def slow_foo(x):
+        calls.append(x)
+        time.sleep(0.3)
+        return x + random.random()
+
+    results = []
+
+    def run():
+        setup_cachedir(cachedir)
+        results.append(slow_foo(1))
+
+    threads = [Thread(target=run) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == [1]
+    assert results[0] == results[1]
+
+
+@pytest.fixture
+def store_backend(cache):
+    return cache.memories[current_thread().name].store_backend
+
+
+def test_cache_lock_hashes_arguments_once(cache, mocker):
+    @cache(lock_timeout=10)
+    def foo_lock(df):
+        return df * 2
+
+    hash_spy = mocker.spy(joblib.hashing, "hash")
+    df = pd.DataFrame({"x": [1, 2, 3]})
+    pd.testing.assert_frame_equal(foo_lock(df), df * 2)
+    assert hash_spy.call_count == 1  # miss: lookup, lock and store
+    pd.testing.assert_frame_equal(foo_lock(df), df * 2)
+    assert hash_spy.call_count == 2
+
+
+def test_cache_item_lock(store_backend):
+    lock = _CacheItemLock(store_backend, ["f", "1234"])
+    assert lock.acquire(timeout=0)
+    assert os.path.exists(lock.filename)
+
+    # the lock is held by a living process (us)
+    other_lock = _CacheItemLock(store_backend, ["f", "1234"])
+    assert not other_lock.acquire(timeout=0.2)
+
+    lock.release()
+    assert not os.path.exists(lock.filename)
+    assert other_lock.acquire(timeout=0)
+    other_lock.release()
+
+
+def test_cache_item_lock_stale(store_backend, mocker):
+    mock_warning = mocker.patch.object(cache_logger, "warning")
+    lock = _CacheItemLock(store_backend, ["f", "1234"])
+    os.makedirs(os.path.dirname(lock.filename))
+
+    # the owner process is dead
+    with open(lock.filename, "w") as f:
+        f.write(f"{socket.gethostname()} 123456789")
+    mocker.patch("toucan_data_sdk.utils.decorators._pid_exists", return_value=False)
+    assert lock.acquire(timeout=0)
+    assert "stale" in mock_warning.call_args[0][0]
+    lock.release()
+
+    # the lock is too old
+    with open(lock.filename, "w") as f:
+        f.write("another-host 1")
+    mocker.patch("toucan_data_sdk.utils.decorators.LOCK_STALE_AFTER", -1)
+    assert lock.acquire(timeout=0)
+    lock.release()
@@ -5,11 +5,26 @@ import types
 import pandas as pd
 import pytest
 
+from toucan_data_sdk.utils.generic import compute_evolution_by_frequency
 from toucan_data_sdk.utils.helpers import (
     clean_cachedir_old_entries,
+    execution_mode,
+    get_execution_mode,
     get_func_sourcecode,
     get_param_value_from_func_call,
     get_temp_column_name,
+    parse_dates,
+    parsed_dates_cache,
+    set_execution_mode,
+)
+from toucan_data_sdk.utils.postprocess import (
+    add,
+    fillna,
+    filter_by_date,
+    percentage,
+    pivot_by_group,
+    rank,
+    upper,
 )
 
 
@@ -70,3 +85,92 @@ def test_get_func_sourcecode(mocker):
 def test_clean_cachedir_old_entries():
     with pytest.raises(ValueError):
         clean_cachedir_old_entries(cachedir=None, func_name="", limit=0)
+
+
+def test_execution_mode():
+    df = pd.DataFrame(
+        {
+            "country": ["france", "spain", "france"],
+            "date": ["2018-01-01", "2018-01-01", "2019-01-01"],
+            "value": [1.0, None, 3.0],
+        }
+    )
+    source = df.copy()
+
+    assert get_execution_mode() == "default"
+    with execution_mode("copy_on_write"):
+        assert pd.get_option("mode.copy_on_write")
+        result = fillna(df, column="value", value=0)
+        result = add(result, new_column="value", column_1="value", column_2=1)
+        result = rank(result, value_cols="value")
+        result = percentage(result, column="value")
+        result = upper(result, column="country")
+        result = filter_by_date(result, date_col="date", start="2018-01-01")
+        compute_evolution_by_frequency(
+            result, id_cols=["country"], date_col="date", value_col="value", freq={"years": 1}
+        )
+        # modifying the result does not modify the input
+        result.loc[0, "value"] = 42
+    pd.testing.assert_frame_equal(df, source)
+    assert result.country.tolist() == ["FRANCE", "SPAIN", "FRANCE"]
+    assert get_execution_mode() == "default"
+    assert not pd.get_option("mode.copy_on_write")
+
+    # no defensive copy: the input is modified
+    groups = {"Group 1": ["france"], "Group 2": ["spain"]}
+    with execution_mode("inplace"):
+        pivot_by_group(df, "country", "value", ["group"], groups)
+    assert df.country.tolist() == ["Group 1", "Group 2", "Group 1"]
+
+    with pytest.raises(ValueError):
+        set_execution_mode("nope")
+
+
+def test_execution_mode_keeps_copy_on_write_option():
+    """The pandas copy-on-write option set by the user is only changed in "copy_on_write" mode"""
+    pd.set_option("mode.copy_on_write", True)
+    try:
+        with execution_mode("inplace"):
+            assert pd.get_option("mode.copy_on_write")
+        with execution_mode("copy_on_write"):
+            assert pd.get_option("mode.copy_on_write")
+        assert pd.get_option("mode.copy_on_write")
+
+        set_execution_mode("copy_on_write")
+        set_execution_mode("default")
+        assert pd.get_option("mode.copy_on_write")
+    finally:
+        pd.set_option("mode.copy_on_write", False)
+
+
+def test_parse_dates(mocker):
+    df = pd.DataFrame({"date": ["01/02/2020", None, "01/02/2020", "03/04/2021"], "value": 1})
+    df.index = [3, 1, 2, 0]
+    expected = pd.to_datetime(df["date"], format="%d/%m/%Y")
+    pd.testing.assert_series_equal(parse_dates(df["date"], format="%d/%m/%Y"), expected)
+
+    to_datetime = mocker.spy(pd, "to_datetime")
+    with parsed_dates_cache():
+        for _ in range(3):
+            result = parse_dates(df["date"], format="%d/%m/%Y")
+            pd.testing.assert_series_equal(result, expected)
+        assert to_datetime.call_count == 1
+        # each distinct value is parsed once
+        assert to_datetime.call_args[0][0].tolist() == ["01/02/2020", "03/04/2021"]
+        parse_dates(df["date"], format="%m/%d/%Y")
+        assert to_datetime.call_count == 2
+    parse_dates(df["date"], format="%d/%m/%Y")
+    assert to_datetime.call_count == 3
+
+
+def test_parse_dates_modified_column():
+    """The dates of a column modified inplace are parsed again"""
+    df = pd.DataFrame({"date": ["2020-01-01", "2020-01-02", None]})
+    with parsed_dates_cache():
+        parse_dates(df["date"])
+        df.loc[df["date"] == "2020-01-01", "date"] = "2021-01-01"
+        assert parse_dates(df["date"]).tolist() == [
+            pd.Timestamp("2021-01-01"),
+            pd.Timestamp("2020-01-02"),
+            pd.NaT,
+        ]
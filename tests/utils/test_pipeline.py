@@ -0,0 +1,129 @@
+import random
+import shutil
+import tempfile
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from toucan_data_sdk.utils.decorators import cache, setup_cachedir
+from toucan_data_sdk.utils.pipeline import Pipeline, _cached_funcs
+
+
+def double(df):
+    return df * 2
+
+
+def add_noise(df):
+    return df + random.random()
+
+
+def split(df):
+    return df.head(1), df.tail(1)
+
+
+@pytest.fixture
+def dfs():
+    return {"a": pd.DataFrame({"x": [1, 2]}), "b": pd.DataFrame({"x": [10, 20]})}
+
+
+def test_pipeline_dag(dfs):
+    pipeline = Pipeline()
+    pipeline.add_step(double, inputs=["a"])
+    pipeline.add_step(double, inputs=["b"], name="double_b")
+
+    @pipeline.step(inputs=["a", "b"], outputs=["c"])
+    def concat(a, b):
+        return pd.concat([a, b])
+
+    pipeline.add_step(split, inputs=["c"], outputs=["first", "last"])
+
+    @pipeline.step(inputs=["first"], outputs=["a"])
+    def overwrite_a(first):
+        return first
+
+    assert pipeline.steps["double"].dependencies == set()
+    assert pipeline.steps["double_b"].dependencies == set()
+    assert pipeline.steps["concat"].dependencies == {"double", "double_b"}
+    assert pipeline.steps["split"].dependencies == {"concat"}
+    # "a" is read by concat, so it must not be overwritten before
+    assert pipeline.steps["overwrite_a"].dependencies == {"double", "concat", "split"}
+
+    result = pipeline.run(dfs)
+    assert list(dfs["a"].x) == [1, 2]  # the input dict is not modified
+    assert list(result["c"].x) == [2, 4, 20, 40]
+    assert list(result["first"].x) == [2]
+    assert list(result["last"].x) == [40]
+    assert list(result["a"].x) == [2]
+    assert set(pipeline.timings) == set(pipeline.steps)
+    assert all(t.finished >= t.started >= 0 for t in pipeline.timings.values())
+    assert "concat" in pipeline.timings_report()
+
+
+def test_pipeline_concurrent_branches(dfs):
+    barrier = threading.Barrier(2, timeout=5)
+
+    def wait_for_other_branch(df):
+        barrier.wait()  # raises if the other branch is not run concurrently
+        return df
+
+    pipeline = Pipeline()
+    pipeline.add_step(wait_for_other_branch, inputs=["a"], name="branch_a")
+    pipeline.add_step(wait_for_other_branch, inputs=["b"], name="branch_b")
+    pipeline.run(dfs, max_workers=2)
+
+
+def test_pipeline_processes(dfs):
+    pipeline = Pipeline()
+    pipeline.add_step(double, inputs=["a"])
+    pipeline.add_step(split, inputs=["b"], outputs=["first", "last"])
+    result = pipeline.run(dfs, max_workers=2, use_processes=True)
+    assert list(result["a"].x) == [2, 4]
+    assert list(result["last"].x) == [20]
+
+
+def test_pipeline_errors(dfs):
+    pipeline = Pipeline()
+    pipeline.add_step(double, inputs=["a"])
+    with pytest.raises(ValueError):
+        pipeline.add_step(double, inputs=["b"])
+    with pytest.raises(ValueError):
+        pipeline.add_step(double, inputs=["a"], outputs=[], name="no_output")
+
+    pipeline.add_step(double, inputs=["unknown"], name="double_unknown")
+    with pytest.raises(ValueError, match="unknown"):
+        pipeline.run(dfs)
+
+    pipeline = Pipeline()
+    pipeline.add_step(double, inputs=["a"], outputs=["c", "d"])
+    with pytest.raises(ValueError, match="must return 2 dataframes"):
+        pipeline.run(dfs)
+
+    def fail(df):
+        time.sleep(0.01)
+        raise ZeroDivisionError
+
+    pipeline = Pipeline()
+    pipeline.add_step(fail, inputs=["a"])
+    pipeline.add_step(double, inputs=["b"])
+    with pytest.raises(ZeroDivisionError):
+        pipeline.run(dfs)
+
+
+def test_pipeline_cache(dfs):
+    cachedir = tempfile.mkdtemp(prefix="pytest_cache")
+    setup_cachedir(cachedir)
+    try:
+        pipeline = Pipeline()
+        pipeline.add_step(add_noise, inputs=["a"], cache=True)
+        pipeline.add_step(add_noise, inputs=["b"], name="not_cached")
+        # the step is wrapped with the @cache decorator once, when it is added
+        cached_add_noise = _cached_funcs[add_noise]
+        run_1, run_2 = pipeline.run(dfs), pipeline.run(dfs)
+        pd.testing.assert_frame_equal(run_1["a"], run_2["a"])
+        assert not run_1["b"].equals(run_2["b"])
+        assert _cached_funcs[add_noise] is cached_add_noise
+    finally:
+        shutil.rmtree(cachedir)
+        del cache.memories
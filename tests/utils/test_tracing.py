@@ -0,0 +1,89 @@
+import json
+import threading
+
+import pandas as pd
+import pytest
+
+from toucan_data_sdk.utils.tracing import (
+    spans_to_chrome_trace,
+    spans_to_json,
+    trace,
+    tracing,
+    write_chrome_trace,
+)
+
+
+@trace
+def double(df):
+    return pd.concat([df, df])
+
+
+@trace(name="augment")
+def main(dfs):
+    return {"domain1": double(dfs["domain1"]), "domain2": double(dfs["domain2"])}
+
+
+@pytest.fixture
+def dfs():
+    return {"domain1": pd.DataFrame({"x": [1, 2, 3]}), "domain2": pd.DataFrame({"y": [1]})}
+
+
+def test_trace_disabled(dfs):
+    # no span recorded but the functions are still called
+    assert main(dfs)["domain1"].shape == (6, 1)
+    assert double.__wrapped__ is not None
+
+
+def test_trace_span_tree(dfs):
+    with tracing() as spans:
+        main(dfs)
+        main(dfs)
+
+    assert [span.name for span in spans] == ["augment", "augment"]
+    root = spans[0]
+    assert root.input_shapes == [(3, 1), (1, 1)]
+    assert root.output_shapes == [(6, 1), (2, 1)]
+    assert root.thread_id == threading.get_ident()
+    assert [child.name for child in root.children] == ["double", "double"]
+    assert root.children[0].input_shapes == [(3, 1)]
+    assert root.children[0].output_shapes == [(6, 1)]
+    assert root.duration_ns >= sum(child.duration_ns for child in root.children) > 0
+    assert root.cpu_time_ns > 0
+
+    # tracing is disabled after the context
+    main(dfs)
+    assert len(spans) == 2
+
+
+def test_trace_error():
+    @trace
+    def fail():
+        raise ValueError("nope")
+
+    with tracing() as spans:
+        with pytest.raises(ValueError):
+            fail()
+
+    assert spans[0].error == "ValueError('nope')"
+
+
+def test_trace_exports(dfs, tmp_path):
+    with tracing() as spans:
+        main(dfs)
+
+    exported = json.loads(spans_to_json(spans))
+    assert exported[0]["name"] == "augment"
+    assert [child["name"] for child in exported[0]["children"]] == ["double", "double"]
+    assert exported[0]["children"][0]["output_shapes"] == [[6, 1]]
+
+    chrome_trace = spans_to_chrome_trace(spans)
+    assert [event["name"] for event in chrome_trace["traceEvents"]] == [
+        "augment",
+        "double",
+        "double",
+    ]
+    assert all(event["ph"] == "X" for event in chrome_trace["traceEvents"])
+
+    path = tmp_path / "trace.json"
+    write_chrome_trace(spans, str(path))
+    assert json.loads(path.read_text()) == json.loads(json.dumps(chrome_trace))
@@ -0,0 +1,107 @@
+"""
+joblib store backends used by the @cache decorator (see `setup_cachedir`).
+
+The "columnar" backend stores the DataFrames returned by the cached functions in
+the Arrow IPC format (a.k.a. feather v2) instead of pickling them: reloading them is
+then bounded by the disk bandwidth and not by unpickling. When the cache is set up
+with a `mmap_mode`, the files are memory mapped and numeric columns are not copied.
+Every other object (or DataFrame that Arrow can't represent faithfully, e.g. with object
+columns holding something else than strings) is pickled as usual.
+
+It requires pyarrow, installed with the "columnar" extra:
+
+    pip install "toucan_data_sdk[columnar]"
+
+Example:
+
+    # augment.py
+    from toucan_data_sdk.utils.decorators import cache, setup_cachedir
+
+    setup_cachedir("/tmp/augment_cache", backend="columnar")
+"""
+import os
+from typing import Any, List
+
+import pandas as pd
+from joblib import register_store_backend
+from joblib._store_backends import FileSystemStoreBackend
+from pandas.api.types import infer_dtype
+
+try:
+    import pyarrow as pa
+    from pyarrow import feather
+except ImportError:  # pragma: no cover
+    pa = feather = None
+
+COLUMNAR_BACKEND = "columnar"
+FEATHER_FILENAME = "output.feather"
+
+
+def _is_arrow_serializable(item: Any) -> bool:
+    """Only plain DataFrames with unique string column names, and whose object columns only hold
+    strings, can be stored in Arrow and come back unchanged (e.g. lists come back as arrays
+    and NaN in a string column as None)"""
+    return (
+        type(item) is pd.DataFrame
+        and not isinstance(item.columns, pd.MultiIndex)
+        and item.columns.is_unique
+        and all(isinstance(column, str) for column in item.columns)
+        and all(
+            infer_dtype(values, skipna=False) == "string"
+            for values in [item.index, *(item[column] for column in item.columns)]
+            if values.dtype == object
+        )
+    )
+
+
+class ColumnarStoreBackend(FileSystemStoreBackend):  # type: ignore[misc]
+    """Filesystem store backend saving DataFrames as feather files, other objects as pickles"""
+
+    def configure(self, location: str, verbose: int = 1, backend_options: Any = None) -> None:
+        if pa is None:
+            raise ImportError(
+                f"pyarrow is required to use the {COLUMNAR_BACKEND!r} cache backend, "
+                f'install it with `pip install "toucan_data_sdk[{COLUMNAR_BACKEND}]"`'
+            )
+        super().configure(location, verbose=verbose, backend_options=backend_options)
+
+    def _feather_filename(self, path: List[str]) -> str:
+        return os.path.join(self.location, *path, FEATHER_FILENAME)
+
+    def load_item(self, path: List[str], verbose: int = 1, **kwargs: Any) -> Any:
+        # the other arguments differ between joblib versions (msg / timestamp, metadata)
+        filename = self._feather_filename(path)
+        if not self._item_exists(filename):
+            return super().load_item(path, verbose=verbose, **kwargs)
+
+        memory_map = self.mmap_mode is not None
+        table = feather.read_table(filename, memory_map=memory_map)
+        # split_blocks avoids the consolidation of columns into 2D blocks (i.e. a copy)
+        return table.to_pandas(split_blocks=memory_map)
+
+    def dump_item(self, path: List[str], item: Any, verbose: int = 1) -> None:
+        if not _is_arrow_serializable(item):
+            super().dump_item(path, item, verbose=verbose)
+            return
+        try:
+            table = pa.Table.from_pandas(item)
+        except pa.ArrowException:
+            # e.g. object columns with mixed types
+            super().dump_item(path, item, verbose=verbose)
+            return
+
+        item_path = os.path.join(self.location, *path)
+        if not self._item_exists(item_path):
+            self.create_location(item_path)
+
+        def write_func(to_write: "pa.Table", dest_filename: str) -> None:
+            # uncompressed so that the file can be memory mapped
+            feather.write_feather(to_write, dest_filename, compression="uncompressed")
+
+        self._concurrency_safe_write(table, self._feather_filename(path), write_func)
+
+    def contains_item(self, path: List[str]) -> bool:
+        return bool(self._item_exists(self._feather_filename(path)) or super().contains_item(path))
+
+
+register_store_backend(COLUMNAR_BACKEND, ColumnarStoreBackend)
@@ -34,23 +34,40 @@ Output:
 Note:
     You can apply multiple decorators to the same function.
     The decorators get applied in order from bottom to top.
+    To time and inspect a whole pipeline, prefer the single `trace` decorator
+    of `toucan_data_sdk.utils.tracing`.
 
 """
+import atexit
 import logging
+import os
+import socket
 import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from functools import partial, wraps
 from hashlib import md5
-from threading import current_thread
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from queue import Queue
+from threading import Condition, Lock, Thread, current_thread
+from typing import Any, Callable, Dict, Generator, List, Optional, Set, Tuple, Union
 
 import joblib
 import pandas as pd
+from joblib._store_backends import StoreBackendBase
+from joblib.func_inspect import filter_args
+from joblib.memory import MemorizedFunc
+from tabulate import tabulate
 
+from .cache_backends import COLUMNAR_BACKEND  # noqa: F401 (registers the backend)
 from .helpers import (
     clean_cachedir_old_entries,
     get_func_sourcecode,
     get_orig_function,
     get_param_value_from_func_call,
+    get_peak_rss,
+    get_rss,
     resolve_dependencies,
 )
 
@@ -102,7 +119,7 @@ def _log_shapes(
 
 
 @catch(_logger)
-def _log_time(logger: logging.Logger, func_name: str, start: int, end: int) -> None:
+def _log_time(logger: logging.Logger, func_name: str, start: float, end: float) -> None:
     duration = (end - start) * 1000
     logger.info(f"{func_name} - time: {duration:0.1f} ms")
 
@@ -137,9 +154,9 @@ def log_time(logger: logging.Logger) -> Callable[..., Any]:
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            start = time.time()
+            start = time.perf_counter()
             result = func(*args, **kwargs)
-            end = time.time()
+            end = time.perf_counter()
             _log_time(logger, func.__name__, start, end)
             return result
 
@@ -170,6 +187,160 @@ def log_shapes(logger: logging.Logger) -> Callable[..., Any]:
     return decorator
 
 
+class MemoryBudgetError(Exception):
+    """
+    Exception raised when a function decorated with log_memory exceeds its memory budget
+    """
+
+
+@dataclass
+class MemoryProfile:
+    """Memory used by a call of a function decorated with log_memory (in bytes)"""
+
+    input_bytes: int = 0
+    output_bytes: int = 0
+    allocated_peak: int = 0
+    allocated_delta: int = 0
+    rss_delta: int = 0
+    peak_rss: int = 0
+
+    @property
+    def amplification(self) -> float:
+        """Peak of memory allocated by the call relative to the size of its input dataframes"""
+        return self.allocated_peak / self.input_bytes if self.input_bytes else 0.0
+
+
+# Last memory profile of each function decorated with log_memory
+_memory_profiles: Dict[str, MemoryProfile] = {}
+# tracemalloc has only one peak, reset by each profiled call: this stack keeps the peaks seen
+# by the nested profiled calls so that they are taken into account by the enclosing ones
+_allocation_peaks: List[int] = []
+
+
+def _get_dfs_memory(*args: Any, **kwargs: Any) -> int:
+    return sum(int(df.memory_usage(deep=True).sum()) for df in _get_dfs(*args, **kwargs))
+
+
+@contextmanager
+def _trace_allocations() -> Generator[Dict[str, int], None, None]:
+    """Measure the memory allocated inside the context (`delta` and `peak`, in bytes)"""
+    measures: Dict[str, int] = {}
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    previous_peak = tracemalloc.get_traced_memory()[1]
+    if hasattr(tracemalloc, "reset_peak"):  # python >= 3.9
+        tracemalloc.reset_peak()
+    start = tracemalloc.get_traced_memory()[0]
+    _allocation_peaks.append(0)
+    try:
+        yield measures
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, _allocation_peaks.pop())
+        if started:
+            tracemalloc.stop()
+        elif _allocation_peaks:
+            _allocation_peaks[-1] = max(_allocation_peaks[-1], previous_peak, peak)
+        measures["delta"] = current - start
+        measures["peak"] = peak - start
+
+
+@catch(_logger)
+def _log_memory(logger: logging.Logger, func_name: str, profile: MemoryProfile) -> None:
+    mb = 1024 * 1024
+    logger.info(
+        f"{func_name} - memory: {profile.input_bytes / mb:0.1f} MB -> "
+        f"{profile.output_bytes / mb:0.1f} MB, allocated peak: {profile.allocated_peak / mb:0.1f} MB "
+        f"(x{profile.amplification:0.1f}), rss: {profile.rss_delta / mb:+0.1f} MB "
+        f"(peak: {profile.peak_rss / mb:0.1f} MB)"
+    )
+
+
+def log_memory(
+    logger: logging.Logger, budget: Optional[int] = None, raise_over_budget: bool = False
+) -> Callable[..., Any]:
+    """
+    Decorator to log the memory used by a function:
+    - the memory usage of its input and output dataframes (`memory_usage(deep=True)`),
+    - the peak and the delta of memory allocated during the call (tracemalloc),
+    - the variation and the peak of the resident set size of the process.
+    The profile of the last call of each function is kept (see `memory_profiles()`).
+
+    Args:
+        logger: the logger
+        budget (int or None): maximum memory (in bytes) the function is allowed to allocate
+        raise_over_budget (bool): raise a MemoryBudgetError instead of logging a warning
+                                  when the budget is exceeded
+
+    Note:
+        tracemalloc slows down the allocations while it is tracing and is not thread-aware:
+        the profiles of functions running concurrently include each other's allocations.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = MemoryProfile(input_bytes=_get_dfs_memory(*args, **kwargs))
+            rss_before = get_rss()
+            with _trace_allocations() as allocations:
+                result = func(*args, **kwargs)
+            profile.rss_delta = get_rss() - rss_before
+            profile.peak_rss = get_peak_rss()
+            profile.allocated_peak = allocations["peak"]
+            profile.allocated_delta = allocations["delta"]
+            profile.output_bytes = _get_dfs_memory(result)
+            _memory_profiles[func.__name__] = profile
+            _log_memory(logger, func.__name__, profile)
+
+            if budget is not None and profile.allocated_peak > budget:
+                message = (
+                    f"{func.__name__} - allocated {profile.allocated_peak} bytes "
+                    f"(budget: {budget} bytes)"
+                )
+                if raise_over_budget:
+                    raise MemoryBudgetError(message)
+                logger.warning(message)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def memory_profiles() -> Dict[str, MemoryProfile]:
+    """Return the last memory profile of each function decorated with log_memory"""
+    return {func_name: replace(profile) for func_name, profile in _memory_profiles.items()}
+
+
+def memory_profiles_report(tablefmt: str = "simple") -> str:
+    """Format the memory profiles as a table, sorted by amplification (highest first)"""
+    headers = [
+        "function",
+        "inputs (MB)",
+        "outputs (MB)",
+        "allocated peak (MB)",
+        "amplification",
+        "rss delta (MB)",
+    ]
+    mb = 1024 * 1024
+    all_profiles = sorted(
+        memory_profiles().items(), key=lambda item: item[1].amplification, reverse=True
+    )
+    rows = [
+        [
+            func_name,
+            profile.input_bytes / mb,
+            profile.output_bytes / mb,
+            profile.allocated_peak / mb,
+            profile.amplification,
+            profile.rss_delta / mb,
+        ]
+        for func_name, profile in all_profiles
+    ]
+    return str(tabulate(rows, headers=headers, tablefmt=tablefmt, floatfmt=".2f"))
+
+
 def log(
     logger: Optional[logging.Logger] = None,
     start_message: str = "Starting...",
@@ -191,9 +362,9 @@ def log(
         @wraps(f)
         def timed(*args, **kwargs):
             logger.info(f"{f.__name__} - {start_message}")
-            start = time.time()
+            start = time.perf_counter()
             res = f(*args, **kwargs)
-            end = time.time()
+            end = time.perf_counter()
             logger.info(f"{f.__name__} - {end_message} (took {end - start:.2f}s)")
             return res
 
@@ -204,7 +375,7 @@ def log(
     return actual_log
 
 
-def domain(domain_name: str) -> Callable[..., Any]:
+def domain(*domain_names: str) -> Callable[..., Any]:
     """
     Allow to apply a function f(df: DataFrame) -> DataFrame) on dfs by specifying the key
     E.g instead of writing:
@@ -219,7 +390,18 @@ def domain(domain_name: str) -> Callable[..., Any]:
         def process_domain1(df):
             #actual process
             return df
+
+    The function can also take several domains and must then return as many dataframes:
+        @domain('domain1', 'domain2')
+        def process_domains(df1, df2):
+            #actual process
+            return df1, df2
+
+    The results are written in place in `dfs` (no new dict is built), which is also returned.
+    Steps working on different domains can be run concurrently with `run_concurrently`.
     """
+    if not domain_names:
+        raise TypeError("domain() requires at least one domain name")
 
     def decorator(func):
         @wraps(func)
@@ -227,24 +409,422 @@ def domain(domain_name: str) -> Callable[..., Any]:
             dfs, *args = args  # type: ignore[assignment]
             if not isinstance(dfs, dict):
                 raise TypeError(f"{dfs} is not a dict")
-            df = dfs.pop(domain_name)
-            df = func(df, *args, **kwargs)
-            return {domain_name: df, **dfs}
+            result = func(*(dfs[name] for name in domain_names), *args, **kwargs)
+            if len(domain_names) == 1:
+                dfs[domain_names[0]] = result
+            else:
+                dfs.update(zip(domain_names, result))
+            return dfs
 
+        wrapper.domains = domain_names  # type: ignore[attr-defined]
         return wrapper
 
     return decorator
 
 
+def run_concurrently(
+    dfs: Dict[str, pd.DataFrame], *steps: Callable[..., Any], max_workers: Optional[int] = None
+) -> Dict[str, pd.DataFrame]:
+    """
+    Run functions decorated with @domain on dfs in a pool of threads.
+    As they are written in place in `dfs`, the steps must work on different domains.
+
+    E.g.:
+        dfs = run_concurrently(dfs, process_domain1, process_domain2)
+    """
+    seen_domains: Set[str] = set()
+    for step in steps:
+        step_domains = set(getattr(step, "domains", ()))
+        if not step_domains:
+            raise TypeError(f"{step.__name__} is not decorated with @domain")
+        if step_domains & seen_domains:
+            raise ValueError(
+                f"{step.__name__} works on domains {sorted(step_domains & seen_domains)} "
+                "already used by another step"
+            )
+        seen_domains |= step_domains
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(step, dfs) for step in steps]
+        for future in futures:
+            future.result()
+    return dfs
+
+
 # ~~~ @cache decorator related stuff ~~~
 
 
+@dataclass
+class CacheStats:
+    """Statistics recorded by the @cache decorator for one function (times are in seconds)"""
+
+    hits: int = 0
+    misses: int = 0
+    hash_time: float = 0.0
+    load_time: float = 0.0
+    compute_time: float = 0.0
+    lock_wait_time: float = 0.0
+    stored_bytes: int = 0
+
+    @property
+    def calls(self) -> int:
+        return self.hits + self.misses
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.hits / self.calls if self.calls else 0.0
+
+
+_cache_stats: Dict[str, CacheStats] = {}
+_cache_stats_lock = Lock()
+
+
+def cache_stats() -> Dict[str, CacheStats]:
+    """Return a copy of the statistics of all the @cache decorated functions,
+    indexed by function name."""
+    with _cache_stats_lock:
+        return {func_name: replace(stats) for func_name, stats in _cache_stats.items()}
+
+
+def reset_cache_stats() -> None:
+    """Forget all the statistics recorded so far"""
+    with _cache_stats_lock:
+        _cache_stats.clear()
+
+
+def cache_stats_report(tablefmt: str = "simple") -> str:
+    """Format the statistics of the @cache decorated functions as a table
+    (sorted by compute time, most expensive functions first).
+
+    Example:
+        >>> print(cache_stats_report())
+        function        hits    misses    hit ratio    hash (ms)    load (ms)    compute (ms)  ...
+        ------------  ------  --------  -----------  -----------  -----------  --------------  ...
+        parse_reseau       3         1         0.75         2.10        45.30         3210.20  ...
+    """
+    headers = [
+        "function",
+        "hits",
+        "misses",
+        "hit ratio",
+        "hash (ms)",
+        "load (ms)",
+        "compute (ms)",
+        "lock wait (ms)",
+        "stored bytes",
+    ]
+    all_stats = sorted(cache_stats().items(), key=lambda item: item[1].compute_time, reverse=True)
+    rows = [
+        [
+            func_name,
+            stats.hits,
+            stats.misses,
+            stats.hit_ratio,
+            stats.hash_time * 1000,
+            stats.load_time * 1000,
+            stats.compute_time * 1000,
+            stats.lock_wait_time * 1000,
+            stats.stored_bytes,
+        ]
+        for func_name, stats in all_stats
+    ]
+    return str(tabulate(rows, headers=headers, tablefmt=tablefmt, floatfmt=".2f"))
+
+
+def _record_cache_stats(func_name: str, **increments: Union[int, float]) -> None:
+    with _cache_stats_lock:
+        stats = _cache_stats.setdefault(func_name, CacheStats())
+        for field_name, increment in increments.items():
+            setattr(stats, field_name, getattr(stats, field_name) + increment)
+
+
+def _get_call_id(
+    memorized_func: MemorizedFunc, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+) -> List[str]:
+    """Path of a call in the store backend of a joblib memorized function: the arguments are
+    hashed here once for the whole call (joblib 1.3 replaced `_get_output_identifiers`
+    by `func_id` and `_get_args_id`)"""
+    if hasattr(memorized_func, "_get_args_id"):
+        return [memorized_func.func_id, memorized_func._get_args_id(*args, **kwargs)]
+    return list(memorized_func._get_output_identifiers(*args, **kwargs))
+
+
+def _get_call_metadata(
+    memorized_func: MemorizedFunc, args: Tuple[Any, ...], kwargs: Dict[str, Any], duration: float
+) -> Dict[str, Any]:
+    """Metadata stored by joblib next to a result (see `MemorizedFunc._persist_input`)"""
+    arguments = filter_args(memorized_func.func, memorized_func.ignore, args, kwargs)
+    return {
+        "duration": duration,
+        "input_args": {name: repr(value) for name, value in arguments.items()},
+        "time": time.time(),
+    }
+
+
+def _is_cached(memorized_func: MemorizedFunc, call_id: List[str]) -> bool:
+    """Whether the result of the call is stored and the code of the function hasn't changed
+    (otherwise joblib clears its results)"""
+    return bool(
+        memorized_func._check_previous_func_code(stacklevel=4)
+        and memorized_func.store_backend.contains_item(call_id)
+    )
+
+
+def _store_result(
+    func_name: str,
+    store_backend: StoreBackendBase,
+    call_id: List[str],
+    result: Any,
+    metadata: Dict[str, Any],
+) -> None:
+    store_backend.dump_item(call_id, result, verbose=0)
+    store_backend.store_metadata(call_id, metadata)
+    item_location = store_backend.get_item_info(call_id)["location"]
+    try:
+        stored_bytes = sum(
+            entry.stat().st_size for entry in os.scandir(item_location) if entry.is_file()
+        )
+    except OSError:
+        stored_bytes = 0
+    _record_cache_stats(func_name, stored_bytes=stored_bytes)
+
+
+# Maximum number of results waiting to be persisted in write-behind mode:
+# when it is reached, the decorated functions block until the writer thread catches up.
+WRITE_BEHIND_MAX_PENDING = 8
+
+
+# func_name, store backend, path of the call, result and its metadata
+# and the lock to release once the result is written
+_WriteRequest = Tuple[
+    str, StoreBackendBase, List[str], Any, Dict[str, Any], Optional["_CacheItemLock"]
+]
+
+
+class _CacheWriter:
+    """Background thread persisting the results of the functions decorated with
+    @cache(write_behind=True)"""
+
+    def __init__(self, max_pending: int) -> None:
+        self._queue: "Queue[_WriteRequest]" = Queue(max_pending)
+        # number of results waiting to be written, by function name
+        self._pending: Dict[str, int] = {}
+        self._condition = Condition()
+        self._thread = Thread(target=self._run, name="cache-writer", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        func_name: str,
+        store_backend: StoreBackendBase,
+        call_id: List[str],
+        result: Any,
+        metadata: Dict[str, Any],
+        item_lock: Optional["_CacheItemLock"] = None,
+    ) -> None:
+        with self._condition:
+            self._pending[func_name] = self._pending.get(func_name, 0) + 1
+        self._queue.put((func_name, store_backend, call_id, result, metadata, item_lock))
+
+    def wait(self, func_name: str) -> None:
+        """Wait until the results of `func_name` still in the queue are persisted"""
+        with self._condition:
+            self._condition.wait_for(lambda: not self._pending.get(func_name))
+
+    def flush(self) -> None:
+        self._queue.join()
+
+    def _run(self) -> None:
+        while True:
+            func_name, store_backend, call_id, result, metadata, item_lock = self._queue.get()
+            try:
+                # the result is stored under the hash of the arguments computed by the caller,
+                # which may have modified them since
+                _store_result(func_name, store_backend, call_id, result, metadata)
+            except Exception:
+                _logger.warning(f"{func_name} - failed to persist cached result")
+            finally:
+                if item_lock is not None:
+                    item_lock.release()
+                with self._condition:
+                    self._pending[func_name] -= 1
+                    self._condition.notify_all()
+                self._queue.task_done()
+
+
+_cache_writer: Optional[_CacheWriter] = None
+_cache_writer_lock = Lock()
+
+
+def _get_cache_writer() -> _CacheWriter:
+    global _cache_writer
+    with _cache_writer_lock:
+        if _cache_writer is None:
+            _cache_writer = _CacheWriter(WRITE_BEHIND_MAX_PENDING)
+            atexit.register(flush_cache_writes)
+    return _cache_writer
+
+
+def flush_cache_writes() -> None:
+    """Block until all the results of @cache(write_behind=True) functions are persisted.
+    It is automatically called when the interpreter exits."""
+    if _cache_writer is not None:
+        _cache_writer.flush()
+
+
+# Stampede protection (opt-in with the `lock_timeout` of @cache): on a cache miss, a lock file
+# is created in the cache directory so that only one process computes the call while the others
+# wait for its result.
+LOCK_POLL_INTERVAL = 0.1
+# A lock older than that (in seconds) is considered stale, as well as a lock whose owner
+# process (on the same host) is dead
+LOCK_STALE_AFTER = 3600
+# Directory of the lock files, in the cache directory
+LOCKS_DIRNAME = "locks"
+
+
+def _pid_exists(pid: int) -> bool:
+    if os.name != "posix":  # pragma: no cover
+        # we can't check it safely, the lock will only be broken when it's too old
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class _CacheItemLock:
+    """Inter-process lock on a cache item, based on the atomic creation of a lock file"""
+
+    def __init__(self, store_backend: StoreBackendBase, path: List[str]) -> None:
+        self.filename = store_backend.get_item_info(path)["location"] + ".lock"
+        self.acquired = False
+
+    def acquire(self, timeout: float) -> bool:
+        """Try to get the lock for `timeout` seconds and return whether it has been acquired"""
+        deadline = time.monotonic() + timeout
+        os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+        while True:
+            try:
+                fd = os.open(self.filename, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                if self._is_stale():
+                    _logger.warning(f"Removing stale cache lock {self.filename}")
+                    self._remove()
+                    continue
+                if time.monotonic() >= deadline:
+                    return False
+                time.sleep(LOCK_POLL_INTERVAL)
+            else:
+                with os.fdopen(fd, "w") as f:
+                    f.write(f"{socket.gethostname()} {os.getpid()}")
+                self.acquired = True
+                return True
+
+    def release(self) -> None:
+        if self.acquired:
+            self._remove()
+            self.acquired = False
+
+    def _remove(self) -> None:
+        try:
+            os.remove(self.filename)
+        except FileNotFoundError:
+            pass
+
+    def _is_stale(self) -> bool:
+        try:
+            age = time.time() - os.path.getmtime(self.filename)
+            with open(self.filename) as f:
+                owner = f.read().split()
+        except OSError:  # the lock has just been released
+            return False
+
+        if age > LOCK_STALE_AFTER:
+            return True
+        # the owner may not have written its identity yet
+        if len(owner) == 2 and owner[0] == socket.gethostname():
+            return not _pid_exists(int(owner[1]))
+        return False
+
+
+def _cached_call(
+    memorized_func: MemorizedFunc,
+    func_name: str,
+    args: Tuple[Any, ...],
+    kwargs: Dict[str, Any],
+    hash_start: float,
+    write_behind: bool = False,
+    lock_timeout: Optional[float] = None,
+) -> Any:
+    """Same as calling `memorized_func(*args, **kwargs)` but the arguments are hashed only once
+    and the hash, load or compute steps are timed and recorded in the statistics of `func_name`.
+    With `write_behind`, the result is persisted by a background thread.
+    With `lock_timeout`, a miss is computed by only one process at a time."""
+    store_backend = memorized_func.store_backend
+    call_id = _get_call_id(memorized_func, args, kwargs)
+    hash_time = time.perf_counter() - hash_start
+    if _cache_writer is not None:
+        # the same call may have been computed recently and still be waiting to be written
+        _cache_writer.wait(func_name)
+
+    lock = None
+    if lock_timeout is not None and not store_backend.contains_item(call_id):
+        # (the lock is named after the hash of the arguments, as the cached result)
+        lock = _CacheItemLock(store_backend, [LOCKS_DIRNAME, func_name, call_id[1]])
+        lock_wait_start = time.perf_counter()
+        if not lock.acquire(lock_timeout):
+            _logger.warning(f"{func_name} - timed out waiting for the cache lock, computing anyway")
+        _record_cache_stats(func_name, lock_wait_time=time.perf_counter() - lock_wait_start)
+
+    release_lock = True
+    try:
+        # (if the result has been computed by another process while we were waiting
+        # for the lock, it is found in the cache)
+        if _is_cached(memorized_func, call_id):
+            load_start = time.perf_counter()
+            try:
+                result = store_backend.load_item(call_id, verbose=0)
+            except Exception:
+                _logger.warning(f"{func_name} - failed to load cached result, recomputing it")
+            else:
+                load_time = time.perf_counter() - load_start
+                _record_cache_stats(func_name, hits=1, hash_time=hash_time, load_time=load_time)
+                return result
+
+        compute_start = time.perf_counter()
+        result = memorized_func.func(*args, **kwargs)
+        compute_time = time.perf_counter() - compute_start
+        _record_cache_stats(func_name, misses=1, hash_time=hash_time, compute_time=compute_time)
+        metadata = _get_call_metadata(memorized_func, args, kwargs, compute_time)
+        if write_behind and memorized_func.mmap_mode is None:
+            # the lock is released by the writer once the result is persisted
+            _get_cache_writer().submit(func_name, store_backend, call_id, result, metadata, lock)
+            release_lock = False
+            return result
+
+        _store_result(func_name, store_backend, call_id, result, metadata)
+    finally:
+        if release_lock and lock is not None:
+            lock.release()
+
+    if memorized_func.mmap_mode is not None:
+        # Memmap the output at the first call to be consistent with later calls
+        return store_backend.load_item(call_id, verbose=0)
+    return result
+
+
 def cache(  # noqa: C901
     requires: Union[None, Callable[..., Any], List[Union[str, Callable[..., Any]]]] = None,
     disabled: bool = False,
     applied_on_method: bool = False,
     check_param: Union[bool, str] = True,
     limit: Optional[int] = None,
+    write_behind: bool = False,
+    lock_timeout: Optional[float] = None,
 ) -> Callable[..., Any]:
     """Avoid to recompute a function if its parameters and its source code doesnt have changed.
 
@@ -257,6 +837,15 @@ def cache(  # noqa: C901
                                                 False to not check any of them.
                                                 True (default) to check all of them.
         limit (int or None): number of cache entries to keep (no limit by default)
+        write_behind (bool): return the result as soon as it is computed and persist it
+                             in a background thread (see `flush_cache_writes`).
+                             The result must not be mutated in place until it is persisted.
+        lock_timeout (float or None): on a cache miss, number of seconds to wait for another
+                                      process computing the same call (instead of computing
+                                      it again). None (default) to disable this locking.
+
+    Hits, misses, hash/load/compute times and stored bytes are recorded for each decorated
+    function, see `cache.stats()` and `cache_stats_report()`.
     """
     requires_list: List[Union[str, Callable[..., Any]]]
     if not requires:
@@ -308,6 +897,7 @@ def cache(  # noqa: C901
 
             # if cache is enabled, we compute the md5 hash of the concatenated source codes
             # of all the dependencies.
+            hash_start = time.perf_counter()
             concatenated_source_code = ""
             dependencies = resolve_dependencies(func.__name__, cache.dependencies)  # type: ignore[attr-defined]
             for func_name in dependencies:
@@ -339,8 +929,7 @@ def cache(  # noqa: C901
                         args = (self_arg,) + args
                     return func(*args, **kwargs)
 
-                f = current_memory.cache(f)
-                result = f(*args, **kwargs)  # type: ignore[no-untyped-call]
+                call_args, call_kwargs = args, kwargs
             else:
                 if isinstance(check_param, str):
                     check_only_param_value = get_param_value_from_func_call(
@@ -351,8 +940,12 @@ def cache(  # noqa: C901
                 def f(*a, **k):
                     return func(*args, **kwargs)
 
-                f = current_memory.cache(f)
-                result = f(**tmp_extra_kwargs)  # type: ignore[no-untyped-call]
+                call_args, call_kwargs = (), tmp_extra_kwargs
+
+            f = current_memory.cache(f)
+            result = _cached_call(
+                f, func.__name__, call_args, call_kwargs, hash_start, write_behind, lock_timeout
+            )
 
             if limit is not None:
                 clean_cachedir_old_entries(
@@ -368,19 +961,31 @@ def cache(  # noqa: C901
     return decorator
 
 
+cache.stats = cache_stats  # type: ignore[attr-defined]
+
 method_cache = partial(cache, applied_on_method=True)
 
 
 def setup_cachedir(
-    cachedir: str, mmap_mode: Optional[str] = None, bytes_limit: Optional[int] = None
+    cachedir: str,
+    mmap_mode: Optional[str] = None,
+    bytes_limit: Optional[int] = None,
+    backend: str = "local",
 ) -> joblib.Memory:
     """This function injects a joblib.Memory object in the cache() function
-    (in a thread-specific slot of its 'memories' attribute)."""
+    (in a thread-specific slot of its 'memories' attribute).
+
+    Use `backend=COLUMNAR_BACKEND` to store the DataFrames in the Arrow format
+    (cf. `toucan_data_sdk.utils.cache_backends`)."""
     if not hasattr(cache, "memories"):
         cache.memories = {}  # type: ignore[attr-defined]
 
     memory = joblib.Memory(
-        location=cachedir, verbose=0, mmap_mode=mmap_mode, bytes_limit=bytes_limit
+        location=cachedir,
+        backend=backend,
+        verbose=0,
+        mmap_mode=mmap_mode,
+        bytes_limit=bytes_limit,
     )
     cache.memories[current_thread().name] = memory  # type: ignore[attr-defined]
     return memory
@@ -10,6 +10,7 @@ from .compute_evolution import (
     compute_evolution,
     compute_evolution_by_criteria,
     compute_evolution_by_frequency,
+    compute_evolutions_by_frequency,
 )
 from .compute_ffill_by_group import compute_ffill_by_group
 from .date_requester import date_requester_generator
@@ -1,13 +1,17 @@
 from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
 from toucan_data_sdk.utils.helpers import (
     ParamsValueError,
     check_params_columns_duplicate,
+    honor_execution_mode,
 )
 
 
+@honor_execution_mode
 def add_missing_row(
     df: pd.DataFrame,
     id_cols: List[str],
@@ -35,6 +39,8 @@ def add_missing_row(
         - `"between"` : add missing rows having their value between min and max values for each group,
         - `"between_and_after"` : add missing rows having their value bigger than min value for each group.
         - `"between_and_before"` : add missing rows having their value smaller than max values for each group.
+      In these modes, only the rows between the bounds of each group are generated
+      (not all the combinations of groups and values), even for a sparse reference column.
     - `cols_to_keep` (*list of str*): name of other columns to keep, linked to the reference_col.
 
     ---
@@ -74,52 +80,123 @@ def add_missing_row(
     else:
         cols_for_index = [reference_col] + cols_to_keep
     check_params_columns_duplicate(id_cols + cols_for_index)
-
-    if method == "between" or method == "between_and_after":
-        df["start"] = df.groupby(id_cols)[reference_col].transform(min)
-        id_cols += ["start"]
-    if method == "between" or method == "between_and_before":
-        df["end"] = df.groupby(id_cols)[reference_col].transform(max)
-        id_cols += ["end"]
-
     names = id_cols + cols_for_index
-    new_df = df.set_index(names)
-    index_values = df.groupby(id_cols).sum().index.values
+    if df.duplicated(names).any():
+        raise ValueError("cannot handle a non-unique multi-index!")
 
+    # The grid is made of integer positions: a row is a (group, complete index value) couple,
+    # the groups being the distinct values of `id_cols`, sorted
+    keys, row_keys = _get_keys(df, id_cols)
     if complete_index is None:
-        complex_index_values = df.groupby(cols_for_index).sum().index.values
-    elif isinstance(complete_index, dict):
-        if complete_index["type"] == "date":
-            freq = complete_index["freq"]
-            date_format = complete_index["format"]
-            start = complete_index["start"]
-            end = complete_index["end"]
-            if isinstance(freq, dict):
-                freq = pd.DateOffset(**{k: int(v) for k, v in freq.items()})
-            new_index = pd.date_range(start=start, end=end, freq=freq)
-            complex_index_values = new_index.strftime(date_format).values
-        else:
-            raise ParamsValueError(f"Unknown complete index type: " f'{complete_index["type"]}')
+        values, row_values = _get_keys(df, cols_for_index)
+        value_codes = np.arange(len(values))
+        nb_codes = len(values)
     else:
-        complex_index_values = list(complete_index)
-
-    def get_tuple(x: Any) -> Tuple[Any, ...]:
-        if not isinstance(x, tuple):
-            return (x,)
-        return x
-
-    new_tuples_index = [
-        get_tuple(x) + get_tuple(y) for x in index_values for y in complex_index_values
-    ]
-
-    new_index = pd.MultiIndex.from_tuples(new_tuples_index, names=names)
-    new_df = new_df.reindex(new_index).reset_index()
+        if cols_to_keep:
+            raise ParamsValueError("cols_to_keep can't be used with a complete_index")
+        values = pd.DataFrame({reference_col: _get_complete_index_values(complete_index)})
+        # (the values of the complete index may be repeated)
+        value_codes, uniques = pd.factorize(values[reference_col])
+        row_values = pd.Index(uniques).get_indexer(df[reference_col])
+        nb_codes = len(uniques)
+
+    starts = ends = None
+    if method in ("between", "between_and_after", "between_and_before"):
+        # (min and max of the ranks of the reference values, faster than on strings)
+        ranks, sorted_references = pd.factorize(df[reference_col], sort=True)
+        references = pd.Series(np.where(ranks >= 0, ranks, np.nan)).groupby(row_keys)
+        references = references.agg(["min", "max"]).reindex(range(len(keys)))
+        # (the groups without reference values are dropped)
+        references = references.dropna().astype(int)
+        new_row_keys = np.full(len(keys) + 1, -1)
+        new_row_keys[references.index] = np.arange(len(references))
+        row_keys = new_row_keys[row_keys]
+        keys = keys.iloc[references.index].reset_index(drop=True)
+        if method != "between_and_before":
+            starts = sorted_references.take(references["min"]).to_numpy()
+        if method != "between_and_after":
+            ends = sorted_references.take(references["max"]).to_numpy()
+    group_positions, value_positions = _get_grid(
+        len(keys), values[reference_col].to_numpy(), starts, ends
+    )
+
+    # Position of the row of `df` matching each row of the grid (-1 for missing rows)
+    found = (row_keys >= 0) & (row_values >= 0)
+    positions = pd.Index(row_keys[found] * nb_codes + row_values[found]).get_indexer(
+        group_positions * nb_codes + value_codes[value_positions]
+    )
+    sources = np.append(np.flatnonzero(found), -1)[positions]
+
+    columns: Dict[str, Any] = {col: keys[col].array.take(group_positions) for col in id_cols}
+    for col in cols_for_index:
+        columns[col] = values[col].array.take(value_positions)
+    for col in df.columns.drop(names):
+        columns[col] = df[col].array.take(sources, allow_fill=True)
+    if method is None:
+        index = None
+    else:
+        # index of the rows in the whole grid
+        index = pd.Index(group_positions * len(values) + value_positions)
+    return pd.DataFrame(columns, index=index)
 
-    if method == "between" or method == "between_and_after":
-        new_df = new_df[new_df[reference_col] >= new_df["start"]]
-        del new_df["start"]
-    if method == "between" or method == "between_and_before":
-        new_df = new_df[new_df[reference_col] <= new_df["end"]]
-        del new_df["end"]
 
-    return new_df
+def _get_keys(df: pd.DataFrame, columns: List[str]) -> Tuple[pd.DataFrame, npt.NDArray[np.intp]]:
+    """
+    Distinct values of `columns` without nulls, sorted like the groups of a groupby,
+    and the position of the values of each row among them (-1 if they contain a null)
+    """
+    keys = df[columns].dropna().drop_duplicates().sort_values(columns, kind="mergesort")
+    keys = keys.reset_index(drop=True)
+    if len(columns) == 1:
+        return keys, pd.Index(keys[columns[0]]).get_indexer(df[columns[0]])
+    return keys, pd.MultiIndex.from_frame(keys).get_indexer(pd.MultiIndex.from_frame(df[columns]))
+
+
+def _get_complete_index_values(complete_index: Union[Dict[str, str], Sequence[str]]) -> List[Any]:
+    if not isinstance(complete_index, dict):
+        return list(complete_index)
+    if complete_index["type"] != "date":
+        raise ParamsValueError(f"Unknown complete index type: " f'{complete_index["type"]}')
+    freq: Any = complete_index["freq"]
+    if isinstance(freq, dict):
+        freq = pd.DateOffset(**{k: int(v) for k, v in freq.items()})
+    dates = pd.date_range(start=complete_index["start"], end=complete_index["end"], freq=freq)
+    return list(dates.strftime(complete_index["format"]))
+
+
+def _get_grid(
+    nb_groups: int,
+    values: npt.NDArray[Any],
+    starts: Optional[npt.NDArray[Any]],
+    ends: Optional[npt.NDArray[Any]],
+) -> Tuple[npt.NDArray[np.intp], npt.NDArray[np.intp]]:
+    """
+    Positions of the group and of the value of the rows of the grid, keeping for each group
+    the values between its start and its end (if given)
+    """
+    if starts is None and ends is None:
+        return (
+            np.repeat(np.arange(nb_groups), len(values)),
+            np.tile(np.arange(len(values)), nb_groups),
+        )
+
+    # The values of a group are contiguous once the values are sorted: only the rows of the
+    # output are generated (and not the whole grid)
+    is_sorted = pd.Index(values).is_monotonic_increasing
+    order = np.arange(len(values)) if is_sorted else np.argsort(values, kind="mergesort")
+    sorted_values = values[order]
+    lows = np.zeros(nb_groups, dtype=np.intp)
+    highs = np.full(nb_groups, len(values), dtype=np.intp)
+    if starts is not None:
+        lows = np.searchsorted(sorted_values, starts, side="left")
+    if ends is not None:
+        highs = np.searchsorted(sorted_values, ends, side="right")
+    counts = np.maximum(highs - lows, 0)
+    group_positions = np.repeat(np.arange(nb_groups), counts)
+    offsets = np.repeat(lows - np.cumsum(counts) + counts, counts)
+    value_positions = order[np.arange(counts.sum()) + offsets]
+    if not is_sorted:
+        # back to the order of the values in each group
+        kept = np.lexsort((value_positions, group_positions))
+        group_positions, value_positions = group_positions[kept], value_positions[kept]
+    return group_positions, value_positions
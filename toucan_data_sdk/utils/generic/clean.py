@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING, Dict, List, Optional
 
-from toucan_data_sdk.utils.helpers import slugify
+from toucan_data_sdk.utils.helpers import honor_execution_mode, slugify
 
 if TYPE_CHECKING:
     import pandas as pd
@@ -16,6 +16,7 @@ def get_int_cols(df: "pd.DataFrame") -> List[str]:
     return [col for col in float_df.columns if all(x.is_integer() for x in float_df[col])]
 
 
+@honor_execution_mode
 def clean_dataframe(
     df: "pd.DataFrame",
     is_slugify: bool = True,
@@ -1,14 +1,24 @@
 import itertools
-from typing import Dict, List, Union
+from typing import Any, Dict, List, Optional, Union
 
 import pandas as pd
+from joblib import Parallel, delayed
+from pandas.api.types import is_numeric_dtype
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode
 
+from .roll_up import ROLL_UP_FUNCS
+
+AggFunc = Union[str, List[Any], Dict[str, Any]]
+
+
+@honor_execution_mode
 def combine_columns_aggregation(
     df: pd.DataFrame,
     id_cols: List[str],
     cols_for_combination: Dict[str, str],
-    agg_func: Union[str, List[str], Dict[str, str]] = "sum",
+    agg_func: AggFunc = "sum",
+    n_jobs: int = 1,
 ) -> pd.DataFrame:
     """
     Aggregates data to reproduce "All" category for requester
@@ -28,6 +38,10 @@ def combine_columns_aggregation(
        - string function name
        - list of functions and/or function names, e.g. [np.sum, 'mean']
        - dict of axis labels -> functions, function names or list of such.
+       With "sum", "count", "min" or "max", the data is only aggregated once by all the columns,
+       the other combinations being aggregated from this result.
+    - `n_jobs` (*int*): number of combinations aggregated at the same time (in threads)
+       with other functions. By default, 1.
     """
     requesters_cols = list(cols_for_combination.keys())
     requester_combination = [
@@ -35,11 +49,66 @@ def combine_columns_aggregation(
         for i in range(0, len(requesters_cols) + 1)
         for item in itertools.combinations(requesters_cols, i)
     ]
-    dfs_result = []
-    for comb in requester_combination:
-        df_tmp = df.fillna(method="ffill").groupby(id_cols + comb).agg(agg_func).reset_index()
-        for key in set(cols_for_combination.keys()) - set(comb):
-            df_tmp[key] = cols_for_combination[key]
-        dfs_result.append(df_tmp)
-
-    return pd.concat(dfs_result, sort=False, ignore_index=True)
+    df = df.fillna(method="ffill")
+    roll_up_funcs = _get_roll_up_funcs(df, id_cols + requesters_cols, agg_func)
+    if roll_up_funcs is None:
+        dfs_result = Parallel(n_jobs=n_jobs, prefer="threads")(
+            delayed(_aggregate)(df, id_cols + comb, agg_func) for comb in requester_combination
+        )
+    else:
+        # Aggregate the rows only once by all the columns (keeping the null keys, which have
+        # values in the other combinations), the other combinations are aggregates of it
+        aggregated = df.groupby(id_cols + requesters_cols, dropna=False).agg(agg_func)
+        dfs_result = [
+            _roll_up(df, aggregated, id_cols + comb, roll_up_funcs)
+            for comb in requester_combination
+        ]
+
+    for comb, df_tmp in zip(requester_combination, dfs_result):
+        for key in requesters_cols:
+            if key not in comb:
+                df_tmp[key] = cols_for_combination[key]
+    result = pd.concat(dfs_result, sort=False, ignore_index=True)
+    if roll_up_funcs is not None:
+        # same order of the columns as when aggregating the rows for each combination
+        if isinstance(agg_func, str):
+            columns = id_cols + [col for col in df.columns if col not in id_cols]
+        else:
+            columns = id_cols + list(agg_func) + [c for c in requesters_cols if c not in agg_func]
+        result = result[[col for col in columns if col in result.columns]]
+    return result
+
+
+def _get_roll_up_funcs(
+    df: pd.DataFrame, keys: List[str], agg_func: AggFunc
+) -> Optional[Dict[str, str]]:
+    """
+    Aggregations computing the aggregates of `agg_func` from the aggregates of a finer grouping,
+    if there is one for each column
+    """
+    if isinstance(agg_func, str):
+        funcs = {col: agg_func for col in df.columns if col not in keys}
+    elif isinstance(agg_func, dict) and all(isinstance(f, str) for f in agg_func.values()):
+        funcs = agg_func
+    else:
+        return None
+    if any(
+        func not in ROLL_UP_FUNCS or (func != "count" and not is_numeric_dtype(df[col]))
+        for col, func in funcs.items()
+    ):
+        return None
+    return {col: ROLL_UP_FUNCS[func] for col, func in funcs.items()}
+
+
+def _aggregate(df: pd.DataFrame, keys: List[str], agg_func: AggFunc) -> pd.DataFrame:
+    return df.groupby(keys).agg(agg_func).reset_index()
+
+
+def _roll_up(
+    df: pd.DataFrame, aggregated: pd.DataFrame, keys: List[str], roll_up_funcs: Dict[str, str]
+) -> pd.DataFrame:
+    if len(keys) < aggregated.index.nlevels:
+        aggregated = aggregated.groupby(level=keys, dropna=False).agg(roll_up_funcs)
+    aggregated = aggregated.reset_index().dropna(subset=keys).reset_index(drop=True)
+    # (a column of null keys, only kept here, may have had its type changed)
+    return aggregated.astype({col: df[col].dtype for col in keys})
@@ -3,12 +3,14 @@ from typing import TYPE_CHECKING, List, Optional
 from toucan_data_sdk.utils.helpers import (
     ParamsValueError,
     check_params_columns_duplicate,
+    honor_execution_mode,
 )
 
 if TYPE_CHECKING:
     import pandas as pd
 
 
+@honor_execution_mode
 def compute_cumsum(
     df: "pd.DataFrame",
     id_cols: List[str],
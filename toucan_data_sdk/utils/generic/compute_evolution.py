@@ -1,20 +1,28 @@
 import logging
-from typing import Any, Dict, List, Literal, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
-from toucan_data_sdk.utils.helpers import check_params_columns_duplicate
+from toucan_data_sdk.utils.helpers import (
+    check_params_columns_duplicate,
+    honor_execution_mode,
+    parse_dates,
+)
 
+Frequency = Union[int, pd.DateOffset, pd.Series, Dict[str, Any]]
 EvolutionFormat = Literal["column", "df"]
 EvolutionMethod = Literal["abs", "pct"]
 
 
+@honor_execution_mode
 def compute_evolution_by_frequency(
     df: pd.DataFrame,
     id_cols: List[str],
     date_col: Union[str, Dict[str, str]],
     value_col: str,
-    freq: Union[int, pd.DateOffset, pd.Series, Dict[str, Any]] = 1,
+    freq: Frequency = 1,
     method: EvolutionMethod = "abs",
     format: EvolutionFormat = "column",
     offseted_suffix: str = "_offseted",
@@ -101,6 +109,7 @@ def compute_evolution_by_frequency(
     )
 
 
+@honor_execution_mode
 def compute_evolution_by_criteria(
     df: pd.DataFrame,
     id_cols: List[str],
@@ -167,12 +176,105 @@ def compute_evolution_by_criteria(
 compute_evolution = compute_evolution_by_frequency
 
 
+@honor_execution_mode
+def compute_evolutions_by_frequency(
+    df: pd.DataFrame,
+    id_cols: List[str],
+    date_col: Union[str, Dict[str, str]],
+    value_cols: List[str],
+    freqs: Union[List[Frequency], Dict[str, Frequency]],
+    method: EvolutionMethod = "abs",
+    offseted_suffix: str = "_offseted",
+    evolution_suffix: str = "_evolution",
+    raise_duplicate_error: bool = True,
+) -> pd.DataFrame:
+    """
+    Same as `compute_evolution_by_frequency` for several value columns and frequencies at once:
+    the dates are parsed and the offseted lines are found once per frequency for all the value
+    columns.
+
+    ---
+
+    ### Parameters
+
+    *mandatory :*
+    - `id_cols` (*list*): name of the columns used to create each group.
+    - `date_col` (*str or dict*): either directly the name of the column containing the date or a dictionary with:
+      - `selector` (*str*): the name of the column
+      - `format` (*str*): the format of the date (see [pandas doc](
+        https://docs.python.org/3/library/datetime.html#strftime-and-strptime-behavior))
+    - `value_cols` (*list*): names of the columns containing the values to compare.
+    - `freqs` (*list or dict*): the frequencies at which we calculate evolutions (see `freq` in
+      `compute_evolution_by_frequency`), by name. In a list, the name of a frequency is the
+      frequency itself (e.g. `1`, `1years` for `{"years": 1}` or `pd.DateOffset(years=1)`,
+      `2D` for `pd.offsets.Day(2)`).
+
+    *optional :*
+    - `method` (*str*): either `"abs"` for absolute values or `"pct"` for the evolution in percentage of previous value.
+    - `offseted_suffix` (*str*): suffix of the offseted columns. By default, `"_offseted"`.
+    - `evolution_suffix` (*str*): suffix of the evolution columns. By default, `"_evolution"`.
+    - `raise_duplicate_error` (*boolean*): raise an error when the dataset has duplicated values with the given `id_cols`.
+
+    For each value column `<value_col>` and frequency named `<freq>`, the columns
+    `<value_col>_<freq><offseted_suffix>` and `<value_col>_<freq><evolution_suffix>` are added.
+
+    ---
+
+    ### Example
+
+    **Input**
+
+    | id |   a |   b | year |
+    |:--:|:---:|:---:|:----:|
+    |  A |  20 |   1 | 2010 |
+    |  A |   7 |   3 | 2011 |
+    |  B | 200 |   5 | 2010 |
+
+    ```cson
+    compute_evolutions_by_frequency:
+      id_cols: ["id"]
+      date_col: "year"
+      value_cols: ["a", "b"]
+      freqs:
+        yoy: 1
+    ```
+
+    **Output**
+
+    | id |   a |   b | year | a_yoy_offseted | a_yoy_evolution | b_yoy_offseted | b_yoy_evolution |
+    |:--:|:---:|:---:|:----:|:--------------:|:---------------:|:--------------:|:---------------:|
+    |  A |  20 |   1 | 2010 |           null |            null |           null |            null |
+    |  A |   7 |   3 | 2011 |             20 |             -13 |              1 |               2 |
+    |  B | 200 |   5 | 2010 |           null |            null |           null |            null |
+    """
+    date_col, dates, date_key = _get_dates(df, date_col)
+    check_params_columns_duplicate(id_cols + value_cols + [date_key])
+    if not isinstance(freqs, dict):
+        freqs = {_get_frequency_name(freq): freq for freq in freqs}
+
+    group_codes = _get_group_codes(df, id_cols)
+    df_with_evolutions = df.reset_index(drop=True)
+    for freq_name, freq in freqs.items():
+        keys, offseted_keys = _get_keys(group_codes, dates, dates + _get_offset(freq))
+        sources, _ = _match_offseted_lines(
+            keys, offseted_keys, np.arange(len(df)), "left", raise_duplicate_error
+        )
+        for value_col in value_cols:
+            suffix = f"_{freq_name}{offseted_suffix}"
+            df_with_evolutions[value_col + suffix] = df[value_col].array.take(
+                sources, allow_fill=True
+            )
+            evolution_col = f"{value_col}_{freq_name}{evolution_suffix}"
+            apply_method(df_with_evolutions, evolution_col, value_col, suffix, method)
+    return df_with_evolutions
+
+
 def __compute_evolution(
     df: pd.DataFrame,
     id_cols: List[str],
     value_col: str,
     date_col: Union[str, Dict[str, str], None] = None,
-    freq: Union[int, pd.DateOffset, pd.Series, Dict[str, Any]] = 1,
+    freq: Frequency = 1,
     compare_to: Optional[str] = None,
     method: EvolutionMethod = "abs",
     format: EvolutionFormat = "column",
@@ -205,41 +307,41 @@ def __compute_evolution(
         fillna(str/int): default None
     """
     if date_col is not None:
-        is_date_to_format = isinstance(date_col, dict) or (df[date_col].dtype == object)
-        if is_date_to_format:
-            if isinstance(date_col, dict):
-                date_format = date_col.get("format", None)
-                date_col = date_col["selector"]
-            else:
-                date_format = None
-            df["_" + date_col + "_copy_"] = pd.to_datetime(df[date_col], format=date_format)
-            date_col = "_" + date_col + "_copy_"
-        assert isinstance(date_col, str)
-
-        if isinstance(freq, dict):
-            freq = pd.DateOffset(**{k: int(v) for k, v in freq.items()})
-
-        check_params_columns_duplicate(id_cols + [value_col, date_col])
-        # create df_offseted
-        group_cols = id_cols + [date_col]
-        df_offseted = df[group_cols + [value_col]].copy()
-        df_offseted[date_col] += freq
-
+        date_col, dates, date_key = _get_dates(df, date_col)
+        check_params_columns_duplicate(id_cols + [value_col, date_key])
+        # The value of a line is compared to the one of the line of its group whose date
+        # shifted by `freq` is the date of the line
+        offseted_dates = dates + _get_offset(freq)
+        keys, offseted_keys = _get_keys(_get_group_codes(df, id_cols), dates, offseted_dates)
+        # with `how="outer"`, the lines of the shifted dates which don't exist are added
+        added_lines_columns = {column: df[column] for column in id_cols}
+        if date_key == date_col:
+            added_lines_columns[date_col] = offseted_dates
         df_with_offseted_values = apply_merge(
-            df, df_offseted, group_cols, how, offseted_suffix, raise_duplicate_error
+            df,
+            keys,
+            offseted_keys,
+            np.arange(len(df)),
+            value_col,
+            how,
+            offseted_suffix,
+            raise_duplicate_error,
+            added_lines_columns,
         )
-        if is_date_to_format:
-            del df_with_offseted_values[date_col]
 
     elif compare_to is not None:
-        # create df_offseted
         check_params_columns_duplicate(id_cols + [value_col])
-        group_cols = id_cols
-        df_offseted = df.query(compare_to).copy()
-        df_offseted = df_offseted[group_cols + [value_col]]
-
+        keys = _get_group_codes(df, id_cols)
+        is_compared = np.asarray(df.eval(compare_to), dtype=bool)
         df_with_offseted_values = apply_merge(
-            df, df_offseted, group_cols, how, offseted_suffix, raise_duplicate_error
+            df,
+            keys,
+            keys[is_compared],
+            np.flatnonzero(is_compared),
+            value_col,
+            how,
+            offseted_suffix,
+            raise_duplicate_error,
         )
 
     apply_fillna(df_with_offseted_values, value_col, offseted_suffix, fillna)
@@ -247,17 +349,81 @@ def __compute_evolution(
     return apply_format(df_with_offseted_values, evolution_col_name, format)
 
 
-def apply_merge(
-    df: pd.DataFrame,
-    df_offseted: pd.DataFrame,
-    group_cols: List[str],
+def _get_group_codes(df: pd.DataFrame, group_cols: List[str]) -> npt.NDArray[np.int64]:
+    """Integer code of the group of each line (missing values are a group)"""
+    if not group_cols:
+        return np.zeros(len(df), dtype=np.int64)
+    codes: npt.NDArray[np.int64] = (
+        df.groupby(group_cols, sort=False, dropna=False).ngroup().to_numpy(dtype=np.int64)
+    )
+    return codes
+
+
+def _get_dates(
+    df: pd.DataFrame, date_col: Union[str, Dict[str, str]]
+) -> Tuple[str, pd.Series, str]:
+    """Returns the name of the date column, the dates and the name used for them
+    (the dates given as strings are parsed, without adding them to `df`)"""
+    is_date_to_format = isinstance(date_col, dict) or (df[date_col].dtype == object)
+    if isinstance(date_col, dict):
+        date_format = date_col.get("format", None)
+        date_col = date_col["selector"]
+    else:
+        date_format = None
+    if is_date_to_format:
+        return date_col, parse_dates(df[date_col], format=date_format), f"_{date_col}_copy_"
+    return date_col, df[date_col], date_col
+
+
+def _get_frequency_name(freq: Frequency) -> str:
+    if isinstance(freq, pd.DateOffset):
+        if type(freq) is not pd.DateOffset:  # e.g. `pd.offsets.MonthEnd()`
+            return str(freq.freqstr)
+        # same name as the equivalent dict (a DateOffset without arguments is one day)
+        freq = {unit: value * freq.n for unit, value in (freq.kwds or {"days": 1}).items()}
+    if isinstance(freq, dict):
+        return "_".join(f"{value}{unit}" for unit, value in freq.items())
+    return str(freq)
+
+
+def _get_offset(freq: Frequency) -> Union[int, pd.DateOffset, pd.Series]:
+    if isinstance(freq, dict):
+        return pd.DateOffset(**{k: int(v) for k, v in freq.items()})
+    return freq
+
+
+def _get_keys(
+    group_codes: npt.NDArray[np.int64], dates: pd.Series, offseted_dates: pd.Series
+) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Integer keys of the (group, date) and (group, offseted date) of each line"""
+    codes, uniques = pd.factorize(pd.concat([dates, offseted_dates], ignore_index=True))
+    codes = codes.astype(np.int64)
+    codes[codes < 0] = len(uniques)  # missing dates
+    date_codes, offseted_date_codes = np.split(codes, [len(dates)])
+    n_dates = len(uniques) + 1
+    return group_codes * n_dates + date_codes, group_codes * n_dates + offseted_date_codes
+
+
+def _match_offseted_lines(
+    keys: npt.NDArray[np.int64],
+    offseted_keys: npt.NDArray[np.int64],
+    offseted_positions: npt.NDArray[np.int64],
     how: str,
-    offseted_suffix: str,
     raise_duplicate_error: bool,
-) -> pd.DataFrame:
-    df_offseted_deduplicated = df_offseted.drop_duplicates(subset=group_cols)
-
-    if df_offseted_deduplicated.shape[0] != df_offseted.shape[0] and how == "left":
+) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """
+    Returns the position of the offseted line of each line (-1 if there is none): the lines
+    whose key is `offseted_keys[i]` get the line at position `offseted_positions[i]`.
+    Also returns the positions of the offseted lines whose key is not the key of any line.
+    """
+    codes, unique_keys = pd.factorize(np.concatenate([offseted_keys, keys]))
+    offseted_codes, codes = np.split(codes, [len(offseted_keys)])
+    # the first line with each offseted key is used
+    first_offseted = np.full(len(unique_keys), -1, dtype=np.int64)
+    first_offseted[offseted_codes[::-1]] = np.arange(len(offseted_codes))[::-1]
+    is_first = first_offseted[offseted_codes] == np.arange(len(offseted_codes))
+
+    if not is_first.all() and how == "left":
         msg = (
             "A dataframe for which you want to compute evolutions "
             "has duplicated values against the id_cols you indicated."
@@ -267,10 +433,57 @@ def apply_merge(
         else:
             logging.getLogger(__name__).warning(f"Warning: {msg}")
 
-    df_with_offseted_values = pd.merge(
-        df, df_offseted_deduplicated, how=how, on=group_cols, suffixes=["", offseted_suffix]
-    ).reset_index(drop=True)
+    matches = first_offseted[codes]
+    is_matched = matches >= 0
+    sources = np.full(len(keys), -1, dtype=np.int64)
+    sources[is_matched] = offseted_positions[matches[is_matched]]
 
+    is_key = np.zeros(len(unique_keys), dtype=bool)
+    is_key[codes] = True
+    return sources, offseted_positions[is_first & ~is_key[offseted_codes]]
+
+
+def apply_merge(
+    df: pd.DataFrame,
+    keys: npt.NDArray[np.int64],
+    offseted_keys: npt.NDArray[np.int64],
+    offseted_positions: npt.NDArray[np.int64],
+    value_col: str,
+    how: str,
+    offseted_suffix: str,
+    raise_duplicate_error: bool,
+    added_lines_columns: Optional[Dict[str, pd.Series]] = None,
+) -> pd.DataFrame:
+    """
+    Add to `df` the column `value_col + offseted_suffix`: the lines whose key is
+    `offseted_keys[i]` get the value of the line at position `offseted_positions[i]`.
+    With `how="outer"`, a line is added for each offseted key which is not a key of `df`,
+    with the values of `added_lines_columns` at the offseted position.
+    """
+    sources, added_positions = _match_offseted_lines(
+        keys, offseted_keys, offseted_positions, how, raise_duplicate_error
+    )
+    values = df[value_col].array
+    df_with_offseted_values = df.reset_index(drop=True)
+    df_with_offseted_values[value_col + offseted_suffix] = values.take(sources, allow_fill=True)
+
+    if how == "outer":
+        # like an outer merge, the lines with the same key are grouped
+        order = np.argsort(pd.factorize(keys)[0], kind="stable")
+        df_with_offseted_values = df_with_offseted_values.take(order).reset_index(drop=True)
+        if len(added_positions):
+            added_lines = pd.DataFrame(
+                {
+                    **{
+                        column: series.to_numpy()[added_positions]
+                        for column, series in (added_lines_columns or {}).items()
+                    },
+                    value_col + offseted_suffix: values[added_positions],
+                }
+            )
+            df_with_offseted_values = pd.concat(
+                [df_with_offseted_values, added_lines], ignore_index=True
+            )
     return df_with_offseted_values
 
 
@@ -1,11 +1,15 @@
 from typing import TYPE_CHECKING, List
 
-from toucan_data_sdk.utils.helpers import check_params_columns_duplicate
+from toucan_data_sdk.utils.helpers import (
+    check_params_columns_duplicate,
+    honor_execution_mode,
+)
 
 if TYPE_CHECKING:
     import pandas as pd
 
 
+@honor_execution_mode
 def compute_ffill_by_group(
     df: "pd.DataFrame", id_cols: List[str], reference_cols: List[str], value_col: str
 ) -> "pd.DataFrame":
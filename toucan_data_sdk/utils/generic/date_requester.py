@@ -2,9 +2,10 @@ from typing import Any, Dict, Optional
 
 import pandas as pd
 
-from ..helpers import setlocale
+from ..helpers import honor_execution_mode, parse_dates, setlocale
 
 
+@honor_execution_mode
 def date_requester_generator(
     df: pd.DataFrame,
     date_column: str,
@@ -87,8 +88,9 @@ def date_requester_generator(
     01 | 2018-01-01 |     Semaine | 2018
     """
     with setlocale(locale):
-        start_date = pd.to_datetime(df[date_column], format=date_column_format).min()
-        end_date = pd.to_datetime(df[date_column], format=date_column_format).max()
+        dates = parse_dates(df[date_column], format=date_column_format)
+        start_date = dates.min()
+        end_date = dates.max()
 
         granularities = granularities or {"date": format}
         others_format = others_format or {}
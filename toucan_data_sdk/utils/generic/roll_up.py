@@ -1,13 +1,20 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 
 import numpy as np
 import pandas as pd
+from pandas.api.types import is_numeric_dtype
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode
 
+# Aggregations of the upper levels computed from the aggregates of the level below
+ROLL_UP_FUNCS = {"sum": "sum", "count": "sum", "min": "min", "max": "max"}
+
+
+@honor_execution_mode
 def roll_up(
     df: pd.DataFrame,
     levels: List[str],
-    groupby_vars: List[str],
+    groupby_vars: Union[str, List[str]],
     extra_groupby_cols: Optional[List[str]] = None,
     var_name: str = "type",
     value_name: str = "value",
@@ -69,32 +76,42 @@ def roll_up(
     |       Idf |      Nan |         250 |      Idf | Region |
     |      Nord |      Nan |          20 |     Nord | Region |
     """
-    dfs = list()
-    groupby_cols_cpy = list(levels)
-    levels_cpy = list(levels)
-    levels_cpy.reverse()
-
     extra_groupby_cols = extra_groupby_cols or []
     drop_levels = drop_levels or []
-    previous_level = None
-    for idx, top_level in enumerate(levels_cpy):
-        # Aggregation
-        gb_df = getattr(
-            df.groupby(groupby_cols_cpy + extra_groupby_cols)[groupby_vars], agg_func
-        )().reset_index()
+    value_cols = [groupby_vars] if isinstance(groupby_vars, str) else groupby_vars
+    roll_up_func = ROLL_UP_FUNCS.get(agg_func)
+    if agg_func == "sum" and not all(is_numeric_dtype(df[col]) for col in value_cols):
+        roll_up_func = None  # (the order of concatenated strings would change)
+
+    if roll_up_func is not None:
+        # Aggregate the rows only once at the lowest level (keeping the null keys, which have
+        # values in the upper levels), the upper levels are aggregates of the level below
+        aggregated = getattr(
+            df.groupby(levels + extra_groupby_cols, dropna=False)[groupby_vars], agg_func
+        )()
+
+    dfs = []
+    for idx in range(len(levels) - 1, -1, -1):
+        # Lowest level column needs a groupby with every levels, the next level needs
+        # every one except the lowest, etc. until the top level column that needs only
+        # itself inside the groupby.
+        groupby_cols = levels[: idx + 1] + extra_groupby_cols
+        if roll_up_func is None:
+            gb_df = getattr(df.groupby(groupby_cols)[groupby_vars], agg_func)().reset_index()
+        else:
+            if idx < len(levels) - 1:
+                aggregated = getattr(
+                    aggregated.groupby(level=groupby_cols, dropna=False), roll_up_func
+                )()
+            gb_df = aggregated.reset_index().dropna(subset=groupby_cols).reset_index(drop=True)
+            # (a column of null keys, only kept here, may have had its type changed)
+            gb_df = gb_df.astype({col: df[col].dtype for col in groupby_cols})
+        if idx > 0 and levels[idx] in drop_levels:  # (the top level is always kept)
+            continue
 
         # Melt-like columns
-        gb_df[var_name] = top_level
-        gb_df[value_name] = gb_df[top_level]
-        gb_df[parent_name] = gb_df[levels_cpy[idx + 1]] if idx < len(levels_cpy) - 1 else np.NaN
+        gb_df[var_name] = levels[idx]
+        gb_df[value_name] = gb_df[levels[idx]]
+        gb_df[parent_name] = gb_df[levels[idx - 1]] if idx > 0 else np.NaN
         dfs.append(gb_df)
-        if previous_level in drop_levels:
-            del dfs[-2]
-        previous_level = top_level
-
-        # Remove one level each time in the groupby: lowest level column needs
-        # a groupby with every levels, the next level needs every one except
-        # the lowest, etc. until the top level column that needs only itself
-        # inside the groupby.
-        groupby_cols_cpy.pop()
     return pd.concat(dfs, sort=False).reset_index()
@@ -2,7 +2,10 @@ from typing import List
 
 import pandas as pd
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode
 
+
+@honor_execution_mode
 def two_values_melt(
     df: pd.DataFrame,
     first_value_vars: List[str],
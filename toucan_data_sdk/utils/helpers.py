@@ -2,13 +2,15 @@ import inspect
 import linecache
 import locale
 import logging
+import os
 import re
 import shutil
+import sys
 import threading
 from contextlib import contextmanager
+from functools import wraps
 from pathlib import Path
 from typing import (
-    TYPE_CHECKING,
     Any,
     Callable,
     Dict,
@@ -17,20 +19,36 @@ from typing import (
     Optional,
     Sequence,
     Tuple,
+    TypeVar,
+    cast,
 )
 
+import pandas as pd
 from joblib._store_backends import CacheItemInfo, StoreBackendBase
 from slugify import slugify as _slugify
 
-if TYPE_CHECKING:
-    import pandas as pd
-
 logger = logging.getLogger(__name__)
 LOCALE_LOCK = threading.Lock()
 CURRENT_LOCALE = locale.getlocale()
 
+# - "default": each function copies or modifies its input dataframe as it always did
+# - "copy_on_write": input dataframes are never modified, data is only copied when needed
+#   (pandas copy-on-write is enabled)
+# - "inplace": input dataframes may be modified, no defensive copy is made
+EXECUTION_MODES = ("default", "copy_on_write", "inplace")
+_execution_mode = "default"
+# Value of the pandas `mode.copy_on_write` option before the "copy_on_write" mode enabled it
+_copy_on_write_option = False
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Dates parsed by `parse_dates` inside a `parsed_dates_cache` block, by column data address and
+# parameters (the parsed column is stored with a copy of the values it was parsed from, to check
+# that the column hasn't been modified since)
+_parsed_dates_cache: Optional[Dict[Tuple[Any, ...], Tuple[pd.Series, pd.Index]]] = None
 
-def get_temp_column_name(df: "pd.DataFrame") -> str:
+
+def get_temp_column_name(df: pd.DataFrame) -> str:
     """Small helper to get a new column name that does not already exist"""
     temp_column_name = "__tmp__"
     while temp_column_name in df.columns:
@@ -186,6 +204,149 @@ def get_cachedir_entries(cachedir: StoreBackendBase, func_name: str) -> List[Cac
     return [e for e in entries if Path(e.path).parent.name == func_name]
 
 
+def get_rss() -> int:
+    """Returns the resident set size (memory actually used) of the current process in bytes,
+    or 0 if it can't be read (only implemented on Linux)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0
+
+
+def get_peak_rss() -> int:
+    """Returns the peak resident set size of the current process in bytes, or 0 if unknown"""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover (windows)
+        return 0
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak_rss if sys.platform == "darwin" else peak_rss * 1024
+
+
+def get_execution_mode() -> str:
+    return _execution_mode
+
+
+def set_execution_mode(mode: str) -> None:
+    """
+    Set how the functions of `utils.postprocess` and `utils.generic` treat their input
+    dataframes (see `EXECUTION_MODES`). The "copy_on_write" mode enables the pandas
+    `mode.copy_on_write` option (pandas >= 1.5) for the whole process, its previous value is
+    restored when leaving this mode.
+    """
+    global _execution_mode, _copy_on_write_option
+    if mode not in EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode {mode!r}, expected one of {EXECUTION_MODES}")
+    if mode == "copy_on_write" and _execution_mode != "copy_on_write":
+        previous_option = _get_copy_on_write_option()
+        if previous_option is None:
+            raise ValueError('The "copy_on_write" execution mode requires pandas >= 1.5')
+        pd.set_option("mode.copy_on_write", True)
+        _copy_on_write_option = previous_option
+    elif mode != "copy_on_write" and _execution_mode == "copy_on_write":
+        pd.set_option("mode.copy_on_write", _copy_on_write_option)
+    _execution_mode = mode
+
+
+def _get_copy_on_write_option() -> Optional[bool]:
+    """Value of the pandas `mode.copy_on_write` option (None if it does not exist)"""
+    try:
+        return cast(bool, pd.get_option("mode.copy_on_write"))
+    except pd.errors.OptionError:
+        return None
+
+
+@contextmanager
+def execution_mode(mode: str) -> Generator[None, None, None]:
+    """Context manager to set the execution mode (the previous mode and pandas
+    `mode.copy_on_write` option are restored on exit)"""
+    previous_mode = _execution_mode
+    previous_option = _get_copy_on_write_option()
+    set_execution_mode(mode)
+    try:
+        yield
+    finally:
+        set_execution_mode(previous_mode)
+        if previous_option is not None:
+            pd.set_option("mode.copy_on_write", previous_option)
+
+
+def honor_execution_mode(func: F) -> F:
+    """
+    Decorator for the functions taking dataframes: in "copy_on_write" mode, they get shallow
+    copies of their input dataframes so that they can modify them freely (the data itself is
+    only copied by pandas when it is modified).
+    """
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _execution_mode == "copy_on_write":
+            args = tuple(_shallow_copy(arg) for arg in args)
+            kwargs = {k: _shallow_copy(v) for k, v in kwargs.items()}
+        return func(*args, **kwargs)
+
+    return cast(F, wrapper)
+
+
+def _shallow_copy(value: Any) -> Any:
+    return value.copy(deep=False) if isinstance(value, pd.DataFrame) else value
+
+
+def copy_if_needed(df: pd.DataFrame) -> pd.DataFrame:
+    """Defensive copy of an input dataframe which is going to be modified, only made in
+    "default" mode (the input can be modified in the other modes, see `honor_execution_mode`)"""
+    return df.copy() if _execution_mode == "default" else df
+
+
+@contextmanager
+def parsed_dates_cache() -> Generator[None, None, None]:
+    """
+    Context manager to keep the dates parsed by `parse_dates` during a pipeline, so that
+    the same column is parsed only once (as long as its values are unchanged)
+    """
+    global _parsed_dates_cache
+    if _parsed_dates_cache is not None:  # already in a pipeline
+        yield
+        return
+    _parsed_dates_cache = {}
+    try:
+        yield
+    finally:
+        _parsed_dates_cache = None
+
+
+def parse_dates(values: pd.Series, format: Optional[str] = None, **kwargs: Any) -> pd.Series:
+    """
+    Same as `pd.to_datetime(values, format=format, **kwargs)`, but each distinct string is only
+    parsed once, and the result is reused by the next calls on the same column in a
+    `parsed_dates_cache` block.
+    """
+    if values.dtype != object:
+        return pd.to_datetime(values, format=format, **kwargs)
+
+    array = values.to_numpy()
+    key = (
+        array.__array_interface__["data"][0],
+        array.strides,
+        len(array),
+        format,
+        *sorted(kwargs.items()),
+    )
+    cached = None if _parsed_dates_cache is None else _parsed_dates_cache.get(key)
+    # (the column may have been modified inplace, or its memory reused by another column)
+    if cached is not None and cached[0].equals(pd.Series(array, copy=False)):
+        parsed = cached[1]
+    else:
+        codes, uniques = pd.factorize(array)
+        parsed = pd.Index(pd.to_datetime(uniques, format=format, **kwargs))
+        parsed = parsed.take(codes, allow_fill=True, fill_value=pd.NaT)
+        if _parsed_dates_cache is not None:
+            _parsed_dates_cache[key] = (pd.Series(array, copy=True), parsed)
+    return pd.Series(parsed, index=values.index, name=values.name)
+
+
 class ParamsValueError(Exception):
     """
     Exception raised when some parameters value are wrong
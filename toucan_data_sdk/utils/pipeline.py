@@ -0,0 +1,252 @@
+"""
+Declarative augment pipelines.
+
+Instead of chaining functions over `dfs`, each step declares the domains it reads and writes.
+The steps then form a DAG (a step waits for the previous steps writing its inputs, or reading
+or writing its outputs) and the independent branches are run concurrently in a pool of threads
+(or processes). Each step can be cached with the @cache decorator and its timings are reported.
+
+Example:
+
+    # augment.py
+    from toucan_data_sdk.utils.pipeline import Pipeline
+
+    pipeline = Pipeline()
+
+    @pipeline.step(inputs=["sales"], cache=True)
+    def clean_sales(df):
+        return df.dropna()
+
+    @pipeline.step(inputs=["stores"])
+    def clean_stores(df):
+        return df.drop_duplicates()
+
+    @pipeline.step(inputs=["sales", "stores"], outputs=["sales_by_store"])
+    def sales_by_store(sales, stores):
+        return sales.merge(stores, on="store_id")
+
+    def augment(dfs):
+        # clean_sales and clean_stores are run concurrently
+        dfs = pipeline.run(dfs)
+        print(pipeline.timings_report())
+        return dfs
+"""
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from dataclasses import dataclass, field
+from threading import current_thread
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import joblib
+import pandas as pd
+from tabulate import tabulate
+
+from .decorators import cache as cache_decorator
+
+
+@dataclass
+class Step:
+    name: str
+    func: Callable[..., Any]
+    inputs: List[str]
+    outputs: List[str]
+    cache: bool = False
+    dependencies: Set[str] = field(default_factory=set)
+
+
+@dataclass
+class StepTiming:
+    """Timings of a step (in seconds): `started` and `finished` are relative to the start of the
+    run and include the scheduling overhead, `duration` is measured by the worker"""
+
+    started: float
+    finished: float = 0.0
+    duration: float = 0.0
+
+
+# Functions of the cached steps wrapped with the @cache decorator, so that they are wrapped only
+# once (when the step is added, or by each worker process since the wrappers can't be pickled)
+_cached_funcs: Dict[Callable[..., Any], Callable[..., Any]] = {}
+
+
+def _get_cached_func(func: Callable[..., Any]) -> Callable[..., Any]:
+    if func not in _cached_funcs:
+        _cached_funcs[func] = cache_decorator()(func)
+    return _cached_funcs[func]
+
+
+def _run_step(
+    func: Callable[..., Any],
+    cached: bool,
+    memory: Optional[joblib.Memory],
+    input_dfs: Sequence[pd.DataFrame],
+) -> Tuple[Any, float]:
+    """Executed by a worker (thread or process): returns the result of the step and its duration"""
+    thread_name = current_thread().name
+    if cached:
+        # the cache memory is registered by thread, so we give the worker the one of the caller
+        if not hasattr(cache_decorator, "memories"):
+            cache_decorator.memories = {}  # type: ignore[attr-defined]
+        previous_memory = cache_decorator.memories.get(thread_name)  # type: ignore[attr-defined]
+        cache_decorator.memories[thread_name] = memory  # type: ignore[attr-defined]
+        func = _get_cached_func(func)
+
+    start = time.perf_counter()
+    try:
+        result = func(*input_dfs)
+    finally:
+        if cached:
+            cache_decorator.memories[thread_name] = previous_memory  # type: ignore[attr-defined]
+    return result, time.perf_counter() - start
+
+
+class Pipeline:
+    def __init__(self) -> None:
+        self.steps: Dict[str, Step] = {}
+        self.timings: Dict[str, StepTiming] = {}
+
+    def add_step(
+        self,
+        func: Callable[..., Any],
+        inputs: List[str],
+        outputs: Optional[List[str]] = None,
+        name: Optional[str] = None,
+        cache: bool = False,
+    ) -> None:
+        """
+        Add a step to the pipeline
+
+        Args:
+            func: function called with the input dataframes (in the order of `inputs`) and
+                  returning the output dataframe, or a tuple of dataframes if there are several
+                  outputs. It must be picklable (i.e. defined at module level) to use processes.
+            inputs: domains read by the step
+            outputs: domains written by the step (same as `inputs` by default)
+            name: name of the step (name of the function by default)
+            cache (bool): cache the results of the step with the @cache decorator
+        """
+        name = name or func.__name__
+        if name in self.steps:
+            raise ValueError(f"A step named {name!r} already exists")
+        outputs = list(inputs) if outputs is None else list(outputs)
+        if not outputs:
+            raise ValueError(f"Step {name!r} must have at least one output")
+
+        # A step depends on the previous steps that write one of its inputs, or that read
+        # or write one of its outputs (so that the order of declaration is respected)
+        dependencies = set()
+        for previous in self.steps.values():
+            if set(previous.outputs) & set(inputs + outputs) or set(previous.inputs) & set(outputs):
+                dependencies.add(previous.name)
+
+        if cache:
+            _get_cached_func(func)
+        self.steps[name] = Step(name, func, list(inputs), outputs, cache, dependencies)
+
+    def step(
+        self,
+        inputs: List[str],
+        outputs: Optional[List[str]] = None,
+        name: Optional[str] = None,
+        cache: bool = False,
+    ) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+        """Decorator version of `add_step`"""
+
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            self.add_step(func, inputs, outputs, name, cache)
+            return func
+
+        return decorator
+
+    def _check_inputs(self, domains: Set[str]) -> None:
+        available = set(domains)
+        for step in self.steps.values():
+            missing = [d for d in step.inputs if d not in available]
+            if missing:
+                raise ValueError(
+                    f"Step {step.name!r} requires domains {missing} which are neither "
+                    "in dfs nor written by a previous step"
+                )
+            available.update(step.outputs)
+
+    def run(
+        self,
+        dfs: Dict[str, pd.DataFrame],
+        max_workers: Optional[int] = None,
+        use_processes: bool = False,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Run the steps, concurrently when they don't depend on each other, and return a new
+        dict of dataframes updated with their outputs. The timings of the steps are then
+        available in `timings`.
+
+        Args:
+            dfs: the input dataframes by domain
+            max_workers (int or None): size of the pool (default of concurrent.futures if None)
+            use_processes (bool): use a pool of processes instead of threads (for steps holding
+                                  the GIL, at the cost of pickling their inputs and outputs)
+        """
+        self._check_inputs(set(dfs))
+        dfs = dict(dfs)
+        self.timings = {}
+        memory = getattr(cache_decorator, "memories", {}).get(current_thread().name)
+        executor: Executor = (ProcessPoolExecutor if use_processes else ThreadPoolExecutor)(
+            max_workers=max_workers
+        )
+        run_start = time.perf_counter()
+        remaining = dict(self.steps)
+        done: Set[str] = set()
+        running: Dict["Future[Tuple[Any, float]]", Step] = {}
+
+        with executor:
+            while remaining or running:
+                ready = [step for step in remaining.values() if step.dependencies <= done]
+                for step in ready:
+                    del remaining[step.name]
+                    input_dfs = [dfs[domain] for domain in step.inputs]
+                    future = executor.submit(_run_step, step.func, step.cache, memory, input_dfs)
+                    running[future] = step
+                    self.timings[step.name] = StepTiming(started=time.perf_counter() - run_start)
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step = running.pop(future)
+                    try:
+                        result, duration = future.result()
+                    except BaseException:
+                        for pending in running:
+                            pending.cancel()
+                        raise
+                    timing = self.timings[step.name]
+                    timing.finished = time.perf_counter() - run_start
+                    timing.duration = duration
+                    dfs.update(self._get_outputs(step, result))
+                    done.add(step.name)
+        return dfs
+
+    @staticmethod
+    def _get_outputs(step: Step, result: Any) -> Dict[str, pd.DataFrame]:
+        if len(step.outputs) == 1:
+            return {step.outputs[0]: result}
+        if not isinstance(result, (tuple, list)) or len(result) != len(step.outputs):
+            raise ValueError(
+                f"Step {step.name!r} must return {len(step.outputs)} dataframes "
+                f"({step.outputs})"
+            )
+        return dict(zip(step.outputs, result))
+
+    def timings_report(self, tablefmt: str = "simple") -> str:
+        """Format the timings of the last run as a table"""
+        headers = ["step", "started (ms)", "finished (ms)", "duration (ms)"]
+        rows = [
+            [name, timing.started * 1000, timing.finished * 1000, timing.duration * 1000]
+            for name, timing in self.timings.items()
+        ]
+        return str(tabulate(rows, headers=headers, tablefmt=tablefmt, floatfmt=".1f"))
@@ -1,11 +1,14 @@
 from typing import TYPE_CHECKING, Dict, List, Union
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode
+
 Agg = Dict[str, str]  # dict of size 1: mapping colomn -> aggregation function
 
 if TYPE_CHECKING:
     import pandas as pd
 
 
+@honor_execution_mode
 def add_aggregation_columns(
     df: "pd.DataFrame", *, group_cols: Union[str, List[str]], aggregations: Dict[str, Agg]
 ) -> "pd.DataFrame":
@@ -1,9 +1,12 @@
 from typing import TYPE_CHECKING, List, Union
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode
+
 if TYPE_CHECKING:
     import pandas as pd
 
 
+@honor_execution_mode
 def argmax(
     df: "pd.DataFrame", column: str, groups: Union[str, List[str], None] = None
 ) -> "pd.DataFrame":
@@ -52,6 +55,7 @@ def argmax(
     return df
 
 
+@honor_execution_mode
 def argmin(
     df: "pd.DataFrame", column: str, groups: Union[str, List[str], None] = None
 ) -> "pd.DataFrame":
@@ -1,11 +1,14 @@
 from typing import List, Optional
-from uuid import uuid4
 
+import numpy as np
 import pandas as pd
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode, parse_dates
+
 from .filter_by_date import parse_date
 
 
+@honor_execution_mode
 def categories_from_dates(
     df: pd.DataFrame,
     date_col: str,
@@ -18,6 +21,8 @@ def categories_from_dates(
     Create a new column of categories based on a date column.
     This function will gather into categories dates from the date column
     based on range steps.
+    The new column is categorical, its categories being ordered like the range steps
+    (missing dates have no category).
 
     For instance, the dates: [2018-01-02, 2018-01-06, 2018-01-15, 2018-01-16, 2018-01-20]
     with the steps: [2018-01-07, 2018-01-18] will give 3 categories:
@@ -92,27 +97,23 @@ def categories_from_dates(
     if len(range_steps) + 1 != len(category_names):
         raise TypeError("category_names should have length len(range_steps)+1")
 
-    date_col_at_date_format = str(uuid4())
-    df[date_col_at_date_format] = pd.to_datetime(df[date_col], format=date_format)
-    df[new_column] = ""
-
-    # first category
-    df[new_column][
-        df[date_col_at_date_format] < parse_date(range_steps[0], date_format)
-    ] = category_names[0]
-
-    # second to before last category
-    for i in range(len(range_steps[:-1])):
-        start = range_steps[i]
-        stop = range_steps[i + 1]
-        mask = (df[date_col_at_date_format] < parse_date(stop, date_format)) & (
-            df[date_col_at_date_format] >= parse_date(start, date_format)
-        )
-        df[new_column][mask] = category_names[i + 1]
-
-    # last category
-    df[new_column][
-        df[date_col_at_date_format] >= parse_date(range_steps[-1], date_format)
-    ] = category_names[-1]
-
-    return df.drop(columns=date_col_at_date_format)
+    dates = parse_dates(df[date_col], format=date_format)
+    steps = pd.DatetimeIndex([parse_date(step, date_format) for step in range_steps])
+    if steps.is_monotonic_increasing:
+        # the i-th category gathers the dates in [steps[i - 1], steps[i])
+        codes = np.searchsorted(steps.to_numpy(), dates.to_numpy(), side="right")
+    else:
+        # each category overwrites the previous ones
+        codes = np.zeros(len(dates), dtype=int)
+        for i, (start, stop) in enumerate(zip(steps[:-1], steps[1:]), start=1):
+            codes[((dates >= start) & (dates < stop)).to_numpy()] = i
+        codes[(dates >= steps[-1]).to_numpy()] = len(steps)
+    codes[dates.isna().to_numpy()] = -1
+
+    # (several categories may have the same name)
+    categories = list(dict.fromkeys(category_names))
+    name_codes = np.array([categories.index(name) for name in category_names])
+    df[new_column] = pd.Categorical.from_codes(
+        np.where(codes >= 0, name_codes[codes], -1), categories=categories, ordered=True
+    )
+    return df
@@ -0,0 +1,245 @@
+"""
+Compile a list of postprocess steps (as written in Toucan configs) into an execution plan.
+
+Consecutive column-wise postprocesses (`add`, `formula`, `replace`, `fillna`, text functions...)
+are fused into a single stage: each of them is applied to a frame made only of the columns it
+reads, instead of the whole dataframe, and the columns computed by the stage are written back
+once at its end.
+Column-wise postprocesses whose result is never used (column overwritten before being read, or
+dropped by a later `groupby` or `melt`) are skipped.
+
+Example:
+
+    steps = [
+        {"postprocess": "fillna", "column": "value", "value": 0},
+        {"postprocess": "formula", "new_column": "ratio", "formula": "`value` / `total`"},
+        {"postprocess": "upper", "column": "country"},
+        {"postprocess": "groupby", "group_cols": ["country"], "aggregations": {"ratio": "sum"}},
+    ]
+    plan = compile_postprocess(steps)
+    print(plan.explain())
+    df = plan(df)
+"""
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Union
+
+import pandas as pd
+
+from toucan_data_sdk.utils.helpers import copy_if_needed, parsed_dates_cache
+
+from .math import MATH_CHARACTERS, _parse_formula, get_new_syntax_formula, is_float
+from .text import __all__ as TEXT_FUNCTIONS
+
+MATH_FUNCTIONS = ("add", "subtract", "multiply", "divide")
+# Text functions creating several columns
+MULTI_COLUMNS_TEXT_FUNCTIONS = ("split", "rsplit", "partition", "rpartition")
+
+
+@dataclass
+class Operation:
+    """A postprocess step: `writes` is the column written by a column-wise postprocess"""
+
+    name: str
+    func: Callable[..., pd.DataFrame]
+    params: Dict[str, Any]
+    reads: List[str] = field(default_factory=list)
+    writes: Optional[str] = None
+
+    @property
+    def is_column_wise(self) -> bool:
+        return self.writes is not None
+
+    def __str__(self) -> str:
+        if self.is_column_wise:
+            return f"{self.name}({', '.join(self.reads)}) -> {self.writes}"
+        return self.name
+
+
+@dataclass
+class FusedStage:
+    """Consecutive column-wise operations applied in one pass. `columns` are the columns written
+    by the steps of the stage (including the skipped ones), in order"""
+
+    operations: List[Operation]
+    columns: List[str] = field(default_factory=list)
+
+    def __call__(self, df: pd.DataFrame) -> pd.DataFrame:
+        computed: Dict[str, pd.Series] = {}
+        for operation in self.operations:
+            assert operation.writes is not None
+            # The written column is also given so that the postprocess behaves as on `df`
+            # (e.g. `df.loc[:, column] = ...` keeps the dtype of an existing column).
+            # The columns of `df` are not copied, except the written one which may be modified
+            # in place.
+            data = {}
+            for column in dict.fromkeys([*operation.reads, operation.writes]):
+                if column in computed:
+                    data[column] = computed[column]
+                elif column in df.columns:
+                    data[column] = df[column]
+                    if column == operation.writes:
+                        data[column] = data[column].copy()
+            frame = pd.concat(data, axis=1, copy=False) if data else pd.DataFrame(index=df.index)
+            frame = operation.func(frame, **operation.params)
+            computed[operation.writes] = frame[operation.writes]
+
+        # the computed columns are written back in a single copy of the input (see `copy_if_needed`),
+        # the new ones in the same order as when the steps are applied one by one
+        df = copy_if_needed(df)
+        for column in dict.fromkeys(self.columns):
+            if column in computed:
+                df[column] = computed[column]
+        return df
+
+    def __str__(self) -> str:
+        return "fused: " + " | ".join(str(operation) for operation in self.operations)
+
+
+Stage = Union[FusedStage, Operation]
+
+
+def _get_formula_columns(formula: str) -> List[str]:
+    if "`" not in formula:  # OLD SYNTAX
+        formula = get_new_syntax_formula(formula)
+    return [
+        token.text
+        for token in _parse_formula(formula)
+        if token.quoted or not (token.text in MATH_CHARACTERS or is_float(token.text))
+    ]
+
+
+def _get_columns_access(name: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Returns the columns read and written by a column-wise postprocess (None otherwise)"""
+    if name in MATH_FUNCTIONS:
+        reads = [params[p] for p in ("column_1", "column_2") if isinstance(params.get(p), str)]
+        return {"reads": reads, "writes": params["new_column"]}
+    if name == "formula":
+        return {"reads": _get_formula_columns(params["formula"]), "writes": params["new_column"]}
+    if name == "fillna":
+        reads = [params["column"]]
+        if params.get("column_value") is not None:
+            reads.append(params["column_value"])
+        return {"reads": reads, "writes": params["column"]}
+    if name == "concat":
+        return {"reads": list(params["columns"]), "writes": params["new_column"]}
+    if name in ("replace", "round_values", "absolute_values") or (
+        name in TEXT_FUNCTIONS and name not in MULTI_COLUMNS_TEXT_FUNCTIONS
+    ):
+        column = params["column"]
+        return {"reads": [column], "writes": params.get("new_column") or column}
+    return None
+
+
+def _get_projection(name: str, params: Dict[str, Any]) -> Optional[Set[str]]:
+    """Returns the only columns of the input dataframe used by a postprocess which drops all the
+    other ones (None if we don't know)"""
+    if name == "groupby":
+        group_cols = params["group_cols"]
+        group_cols = [group_cols] if isinstance(group_cols, str) else group_cols
+        return {*group_cols, *params["aggregations"]}
+    if name == "melt":
+        return {*params["id"], *params["value"]}
+    if name == "select":  # only available in lazy frames (see `lazy.py`)
+        return set(params["columns"])
+    return None
+
+
+def _resolve_postprocess(name: str) -> Callable[..., pd.DataFrame]:
+    import toucan_data_sdk.utils.generic as generic_functions
+    import toucan_data_sdk.utils.postprocess as postprocess_functions
+
+    func = getattr(postprocess_functions, name, None) or getattr(generic_functions, name, None)
+    if not callable(func):
+        raise ValueError(f"Unknown postprocess {name!r}")
+    return func  # type: ignore[no-any-return]
+
+
+def _remove_dead_operations(operations: List[Operation]) -> List[Operation]:
+    """Walk the operations backwards to find the columns which are used later and skip the
+    column-wise operations writing unused columns"""
+    # Columns used after the current operation: either all the columns but `dead`
+    # or only the `live` ones
+    all_live = True
+    dead: Set[str] = set()
+    live: Set[str] = set()
+    kept: List[Operation] = []
+    for operation in reversed(operations):
+        if operation.is_column_wise:
+            assert operation.writes is not None
+            is_used = operation.writes not in dead if all_live else operation.writes in live
+            if not is_used:
+                continue
+            if all_live:
+                dead = (dead | {operation.writes}) - set(operation.reads)
+            else:
+                live = (live - {operation.writes}) | set(operation.reads)
+        else:
+            projection = _get_projection(operation.name, operation.params)
+            if projection is None:
+                # it may use any column
+                all_live, dead = True, set()
+            else:
+                all_live, live = False, projection
+        kept.append(operation)
+    return kept[::-1]
+
+
+class PostprocessPlan:
+    def __init__(self, stages: List[Stage]) -> None:
+        self.stages = stages
+
+    def __call__(self, df: pd.DataFrame) -> pd.DataFrame:
+        # the date columns are parsed only once for the whole pipeline
+        with parsed_dates_cache():
+            for stage in self.stages:
+                if isinstance(stage, FusedStage):
+                    df = stage(df)
+                else:
+                    df = stage.func(df, **stage.params)
+        return df
+
+    def explain(self) -> str:
+        return "\n".join(f"{i}. {stage}" for i, stage in enumerate(self.stages, start=1))
+
+
+def _build_operation(step: Dict[str, Any]) -> Operation:
+    params = dict(step)
+    name = params.pop("postprocess")
+    operation = Operation(name, _resolve_postprocess(name), params)
+    columns_access = _get_columns_access(name, params)
+    if columns_access is not None:
+        operation.reads = columns_access["reads"]
+        operation.writes = columns_access["writes"]
+    return operation
+
+
+def _build_plan(operations: List[Operation]) -> PostprocessPlan:
+    live_operations = {id(operation) for operation in _remove_dead_operations(operations)}
+    stages: List[Stage] = []
+    for operation in operations:
+        if not operation.is_column_wise:
+            stages.append(operation)
+            continue
+        if not (stages and isinstance(stages[-1], FusedStage)):
+            stages.append(FusedStage([]))
+        stage = stages[-1]
+        assert isinstance(stage, FusedStage) and operation.writes is not None
+        stage.columns.append(operation.writes)
+        if id(operation) in live_operations:
+            stage.operations.append(operation)
+    # (stages made only of skipped steps)
+    stages = [stage for stage in stages if not isinstance(stage, FusedStage) or stage.operations]
+    return PostprocessPlan(stages)
+
+
+def compile_postprocess(steps: List[Dict[str, Any]]) -> PostprocessPlan:
+    """
+    Build the execution plan of a list of postprocess steps like
+    `{"postprocess": "formula", "new_column": "ratio", "formula": "`a` / `b`"}`
+    """
+    return _build_plan([_build_operation(step) for step in steps])
+
+
+def apply_postprocess(df: pd.DataFrame, steps: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Compile and apply a list of postprocess steps to `df`"""
+    return compile_postprocess(steps)(df)
@@ -2,7 +2,10 @@ from typing import Optional
 
 import pandas as pd
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode, parse_dates
 
+
+@honor_execution_mode
 def convert_str_to_datetime(df: pd.DataFrame, *, column: str, format: str) -> pd.DataFrame:
     """
     Convert string column into datetime column
@@ -16,10 +19,11 @@ def convert_str_to_datetime(df: pd.DataFrame, *, column: str, format: str) -> pd
     - `format` (*str*): current format of the values (see [available formats](
     https://docs.python.org/3/library/datetime.html#strftime-and-strptime-behavior))
     """
-    df[column] = pd.to_datetime(df[column], format=format)
+    df[column] = parse_dates(df[column], format=format)
     return df
 
 
+@honor_execution_mode
 def convert_datetime_to_str(
     df: pd.DataFrame, *, column: str, format: str, new_column: Optional[str] = None
 ) -> pd.DataFrame:
@@ -43,6 +47,7 @@ def convert_datetime_to_str(
     return df
 
 
+@honor_execution_mode
 def change_date_format(
     df: pd.DataFrame,
     *,
@@ -96,13 +101,14 @@ def change_date_format(
     """
     new_column = new_column or column
     df[new_column] = (
-        pd.to_datetime(df[column], format=input_format, utc=True)
+        parse_dates(df[column], format=input_format, utc=True)
         .dt.tz_convert(new_time_zone)
         .dt.strftime(output_format)
     )
     return df
 
 
+@honor_execution_mode
 def cast(
     df: pd.DataFrame, column: str, type: str, new_column: Optional[str] = None
 ) -> pd.DataFrame:
@@ -3,7 +3,10 @@ from typing import List, Union
 
 import pandas as pd
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode, parse_dates
 
+
+@honor_execution_mode
 def cumsum(
     df: pd.DataFrame,
     new_column: str,
@@ -20,7 +23,7 @@ def cumsum(
     if isinstance(index, str):
         index = [index]
     levels = list(range(0, len(index)))
-    df[date_temp] = pd.to_datetime(df[date_column], format=date_format)
+    df[date_temp] = parse_dates(df[date_column], format=date_format)
     reference_cols = [date_temp, date_column]
     df = df.groupby(index + reference_cols).sum()
     df[new_column] = df.groupby(level=levels)[column].cumsum()
@@ -2,10 +2,13 @@ from typing import TYPE_CHECKING, Optional, Union
 
 from numpy import nan
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode
+
 if TYPE_CHECKING:
     import pandas as pd
 
 
+@honor_execution_mode
 def fillna(
     df: "pd.DataFrame",
     column: str,
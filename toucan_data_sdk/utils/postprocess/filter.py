@@ -1,9 +1,12 @@
 from typing import TYPE_CHECKING, List, Optional
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode
+
 if TYPE_CHECKING:
     import pandas as pd
 
 
+@honor_execution_mode
 def drop_duplicates(df: "pd.DataFrame", columns: Optional[List[str]]) -> "pd.DataFrame":
     """
     Remove duplicate rows
@@ -43,6 +46,7 @@ def drop_duplicates(df: "pd.DataFrame", columns: Optional[List[str]]) -> "pd.Dat
     return df.drop_duplicates(columns)
 
 
+@honor_execution_mode
 def query(df, query):
     """
     Filter a dataset under a condition
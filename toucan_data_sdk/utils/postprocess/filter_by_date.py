@@ -3,9 +3,15 @@ import re
 from calendar import monthrange
 from datetime import date, datetime, timedelta
 from typing import Optional, cast
-from uuid import uuid4
 
 import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype
+
+from toucan_data_sdk.utils.helpers import (
+    copy_if_needed,
+    honor_execution_mode,
+    parse_dates,
+)
 
 TIMEDELTA_RGX = re.compile(r"\s*(?P<num>\d+)\s*(?P<unit>\w+)$")
 
@@ -153,6 +159,7 @@ def parse_date(datestr: str, date_fmt: str) -> pd.Timestamp:
     return pd.Timestamp(dateobj)
 
 
+@honor_execution_mode
 def filter_by_date(
     df: pd.DataFrame,
     date_col: str,
@@ -189,6 +196,7 @@ def filter_by_date(
 
     *mandatory :*
     - `date_col` (*str*): the name of the dataframe's column to filter on
+      (or of its index, if it is a `DatetimeIndex`)
 
     *optional :*
     - `date_format` (*str*): expected date format in column `date_col` (see [available formats](
@@ -197,27 +205,39 @@ def filter_by_date(
     - `stop` (*str*): if specified, upper bound (excluded) of the date range
     - `atdate` (*str*): if specified, the exact date we're filtering on
     """
-    mask = None
     if start is None and stop is None and atdate is None:
         raise TypeError('either "start", "stop" or "atdate" must be specified')
     if start is not None and atdate is not None:
         raise TypeError('"start" and "atdate" are mutually exclusive')
     if stop is not None and atdate is not None:
         raise TypeError('"stop" and "atdate" are mutually exclusive')
-    # add a new column that will hold actual date objects instead of strings.
-    # This column is just temporary and will be removed before returning the
-    # filtered dataframe.
-    filtercol = str(uuid4())
-    df[filtercol] = pd.to_datetime(df[date_col], format=date_format)
+    if date_col not in df.columns and df.index.name == date_col:
+        dates = parse_dates(df.index.to_series(), format=date_format)
+    else:
+        dates = parse_dates(df[date_col], format=date_format)
+
+    lower_bound = start if atdate is None else atdate
+    upper_bound = stop if atdate is None else atdate
+    lower = None if lower_bound is None else parse_date(lower_bound, date_format)
+    upper = None if upper_bound is None else parse_date(upper_bound, date_format)
+    if is_datetime64_any_dtype(dates) and dates.is_monotonic_increasing:
+        # The dates are sorted: the lines to keep are found by binary search and returned
+        # as a slice (copied in the "default" execution mode)
+        first = 0 if lower is None else dates.searchsorted(lower, side="left")
+        last = (
+            len(dates)
+            if upper is None
+            else dates.searchsorted(upper, side="left" if atdate is None else "right")
+        )
+        return copy_if_needed(df.iloc[first:last])
+
     if atdate is not None:
-        mask = df[filtercol] == parse_date(atdate, date_format)
+        mask = dates == lower
     elif start is not None and stop is not None:
-        mask = (df[filtercol] >= parse_date(start, date_format)) & (
-            df[filtercol] < parse_date(stop, date_format)
-        )
+        mask = (dates >= lower) & (dates < upper)
     # atdate is None and start or stop is None
     elif start is not None and stop is None:
-        mask = df[filtercol] >= parse_date(start, date_format)
+        mask = dates >= lower
     elif stop is not None and start is None:
-        mask = df[filtercol] < parse_date(stop, date_format)
-    return df[mask].drop(filtercol, axis=1)
+        mask = dates < upper
+    return df[mask]
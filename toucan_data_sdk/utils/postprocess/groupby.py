@@ -1,9 +1,12 @@
 from typing import TYPE_CHECKING, Dict, List, Union
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode
+
 if TYPE_CHECKING:
     import pandas as pd
 
 
+@honor_execution_mode
 def groupby(
     df: "pd.DataFrame",
     *,
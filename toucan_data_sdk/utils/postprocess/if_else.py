@@ -1,8 +1,12 @@
 from typing import Any, Dict, List, Union
 
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 from typing_extensions import TypeAlias
 
+from toucan_data_sdk.utils.helpers import copy_if_needed, honor_execution_mode
+
 Condition = Dict[str, Any]
 
 
@@ -25,6 +29,7 @@ def _apply_condition(
     # Postprocesses
     if isinstance(condition, list):
         for postprocess_infos in condition:
+            postprocess_infos = dict(postprocess_infos)
             postprocess_name = postprocess_infos.pop("postprocess")
             # Retrieve the right postprocess function
             if postprocess_name == "if_else":
@@ -49,6 +54,7 @@ _Then: TypeAlias = Union[str, int, float, Condition, List[Condition]]
 _Else: TypeAlias = Union[None, str, int, float, Condition, List[Condition]]
 
 
+@honor_execution_mode
 def if_else(
     df: pd.DataFrame, *, new_column: str, **kwargs: Union[_If, _Then, _Else]
 ) -> pd.DataFrame:
@@ -72,6 +78,9 @@ def if_else(
     - `else`: same as then but for the non filtered part.
       If not set, the non filtered part won't have any values for the new column
 
+    The index of the dataframe is kept, even if it is not unique
+    (it used to be reset to a `RangeIndex` in that case).
+
     ---
 
     ### Example
@@ -104,25 +113,86 @@ def if_else(
     | France   |   Nice   |    3  |      4     | 3.5  |
     |  Hell    | HellCity |   -10 |      0     | -5.0 |
     """
-    # If the index is not unique (e.g. if the dataframe is a concatenation
-    # of multiple dataframes), recompute it
-    if not df.index.is_unique:
-        df.index = pd.RangeIndex(len(df.index))
-
     if not (if_ := kwargs.get("if")):
         raise ValueError("'if' parameter is mandatory")
     if not (then_ := kwargs.get("then")):
         raise ValueError("'then' parameter is mandatory")
     else_ = kwargs.get("else")
 
-    if_sub_df = df.query(if_)
-    else_sub_df = df[~df.index.isin(if_sub_df.index)]
-
-    if_sub_df = _apply_condition(if_sub_df, then_, new_column)
-    else_sub_df = _apply_condition(else_sub_df, else_, new_column)
-
-    new_df = pd.concat([if_sub_df, else_sub_df]).sort_index()
+    # The condition is evaluated once and the branches are only computed if they are postprocesses
+    mask = np.asarray(df.eval(if_), dtype=bool)
+    if not _is_postprocess(then_) and not _is_postprocess(else_):
+        new_df = copy_if_needed(df)
+        new_df[new_column] = _where(mask, then_, else_)
+        return new_df
 
+    if_sub_df = df[mask]
+    else_sub_df = df[~mask]
+    if not df.index.is_unique:
+        # If the index is not unique (e.g. if the dataframe is a concatenation
+        # of multiple dataframes), the postprocesses get the positions of the lines instead
+        if_sub_df.index = pd.Index(np.flatnonzero(mask))
+        else_sub_df.index = pd.Index(np.flatnonzero(~mask))
+    if_result = _apply_condition(if_sub_df, then_, new_column)
+    else_result = _apply_condition(else_sub_df, else_, new_column)
+    if not (
+        if_result.index.equals(if_sub_df.index) and else_result.index.equals(else_sub_df.index)
+    ):
+        # The postprocesses have filtered or sorted the lines: put them back in order by index
+        return _concat_by_index(df, if_result, else_result)
+
+    # Write the columns of the two branches back in the lines they come from
+    positions = np.concatenate([np.flatnonzero(mask), np.flatnonzero(~mask)])
+    inverse = np.empty_like(positions)
+    inverse[positions] = np.arange(len(positions))
+    columns = dict.fromkeys([*df.columns, *if_result.columns, *else_result.columns])
+    new_df = pd.DataFrame(
+        {
+            column: _concat_column(if_result, else_result, column)
+            .take(inverse)
+            .reset_index(drop=True)
+            for column in columns
+        }
+    )
+    new_df.index = df.index
+    return new_df
+
+
+def _is_postprocess(condition: Union[_Then, _Else]) -> bool:
+    return isinstance(condition, (dict, list))
+
+
+def _where(mask: npt.NDArray[np.bool_], then_: Any, else_: Any) -> npt.NDArray[Any]:
+    """Values of the new column when both branches are simple values, with the dtype
+    we would get by concatenating the if and else lines"""
+    n_if = int(mask.sum())
+    parts = [
+        pd.DataFrame({"values": value}, index=range(min(size, 1)))
+        for value, size in ((then_, n_if), (else_, len(mask) - n_if))
+    ]
+    dtype = pd.concat(parts)["values"].dtype
+    if dtype == object:
+        return np.where(mask, np.array(then_, dtype=object), np.array(else_, dtype=object))
+    return np.where(
+        mask, np.nan if then_ is None else then_, np.nan if else_ is None else else_
+    ).astype(dtype)
+
+
+def _concat_column(if_df: pd.DataFrame, else_df: pd.DataFrame, column: str) -> pd.Series:
+    """Values of a column of the if lines followed by the ones of the else lines
+    (with the dtype and missing values we would get by concatenating the two dataframes)"""
+    parts = [
+        df[[column]] if column in df.columns else pd.DataFrame(index=df.index)
+        for df in (if_df, else_df)
+    ]
+    return pd.concat(parts, ignore_index=True)[column]
+
+
+def _concat_by_index(df: pd.DataFrame, if_df: pd.DataFrame, else_df: pd.DataFrame) -> pd.DataFrame:
+    new_df = pd.concat([if_df, else_df]).sort_index()
+    if not df.index.is_unique:
+        # The lines are indexed by their positions: put back their original labels
+        new_df.index = df.index.take(new_df.index.to_numpy())
     # Put back the order in columns
     new_cols = [col for col in new_df.columns if col not in df.columns]
     return new_df[[*df.columns, *new_cols]]
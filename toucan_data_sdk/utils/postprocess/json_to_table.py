@@ -3,6 +3,8 @@ from typing import Any, List, Union
 
 from pandas import DataFrame, Series, json_normalize
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode
+
 INTERNAL_SEP = str(uuid.uuid1())
 
 
@@ -11,6 +13,7 @@ def _first_valid_value(serie: Series) -> Any:
     return serie[first_valid_index] if first_valid_index is not None else None
 
 
+@honor_execution_mode
 def json_to_table(df: DataFrame, columns: Union[str, List[str]], sep: str = ".") -> DataFrame:
     """
     Flatten JSON into a table shape. Add lines for each element of a nested array.
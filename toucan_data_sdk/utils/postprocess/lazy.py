@@ -0,0 +1,181 @@
+"""
+Lazy postprocess pipelines: the postprocess functions called on a `LazyFrame` are only recorded,
+and executed when `collect()` is called.
+
+Before execution, the recorded operations are optimized:
+ - filters (`query`, `filter_by_date`) are moved before the column-wise postprocesses
+   (`formula`, `replace`, text functions...) and the column selections that don't affect
+   the columns they read, so that these postprocesses are applied on fewer rows,
+ - when the result only depends on some columns of the source dataframe (the pipeline ends
+   with a `groupby`, a `melt` or a `select`), the other ones are dropped first,
+ - consecutive column-wise postprocesses are fused (see `compiler.py`).
+
+Example:
+
+    df = (
+        LazyFrame(df)
+        .upper(column="country")
+        .formula(new_column="ratio", formula="`value` / `total`")
+        .filter_by_date(date_col="date", start="2018-01-01")
+        .query(query="country == 'FRANCE'")
+        .groupby(group_cols=["country"], aggregations={"ratio": "sum"})
+    )
+    print(df.explain())
+    # 1. select
+    # 2. filter_by_date
+    # 3. fused: upper(country) -> country
+    # 4. query
+    # 5. fused: formula(value, total) -> ratio
+    # 6. groupby
+    df = df.collect()
+"""
+import re
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import pandas as pd
+
+from .compiler import (
+    Operation,
+    PostprocessPlan,
+    _build_operation,
+    _build_plan,
+    _get_projection,
+    _resolve_postprocess,
+)
+
+FILTER_FUNCTIONS = ("query", "filter_by_date")
+# Column-wise postprocesses which can't be applied on a subset of the rows
+NOT_ROW_WISE_FUNCTIONS = ("concat",)
+
+QUERY_STRING_RGX = re.compile(r"'[^']*'|\"[^\"]*\"")
+QUERY_COLUMN_RGX = re.compile(r"`([^`]+)`|([A-Za-z_]\w*)")
+
+
+def _select(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        raise KeyError(f"Columns {missing} not found")
+    # unlike `df[columns]`, `reindex` does not return a frame flagged as a copy of `df`,
+    # so the next postprocesses can add columns to it without warnings
+    return df.reindex(columns=columns)
+
+
+def _get_query_columns(query: str) -> Set[str]:
+    """Over-approximation of the columns used by a query (all the identifiers outside strings)"""
+    query = QUERY_STRING_RGX.sub("", query)
+    return {quoted or name for quoted, name in QUERY_COLUMN_RGX.findall(query)}
+
+
+def _get_filter_columns(operation: Operation) -> Optional[Set[str]]:
+    """Returns the columns read by a postprocess which only filters or sorts the rows
+    (None for other postprocesses)"""
+    if operation.name == "query":
+        return _get_query_columns(operation.params["query"])
+    if operation.name == "filter_by_date":
+        return {operation.params["date_col"]}
+    if operation.name == "sort":
+        columns = operation.params["columns"]
+        return {columns} if isinstance(columns, str) else set(columns)
+    return None
+
+
+def _can_cross(operation: Operation, filter_columns: Set[str]) -> bool:
+    """Whether a filter reading `filter_columns` can be applied before `operation`"""
+    if operation.is_column_wise:
+        return (
+            operation.name not in NOT_ROW_WISE_FUNCTIONS and operation.writes not in filter_columns
+        )
+    if operation.name == "select":
+        return filter_columns <= set(operation.params["columns"])
+    return False
+
+
+def _push_down_filters(operations: List[Operation]) -> List[Operation]:
+    result: List[Operation] = []
+    for operation in operations:
+        position = len(result)
+        if operation.name in FILTER_FUNCTIONS:
+            filter_columns = _get_filter_columns(operation)
+            assert filter_columns is not None
+            while position > 0 and _can_cross(result[position - 1], filter_columns):
+                position -= 1
+        result.insert(position, operation)
+    return result
+
+
+def _get_required_columns(operations: List[Operation]) -> Optional[Set[str]]:
+    """Walk the operations backwards to find the columns of the source dataframe used to compute
+    the result (None if they may all be used)"""
+    live: Optional[Set[str]] = None
+    for operation in reversed(operations):
+        if operation.is_column_wise:
+            if live is not None and operation.writes in live:
+                live = (live - {operation.writes}) | set(operation.reads)
+            continue
+        projection = _get_projection(operation.name, operation.params)
+        if projection is not None:
+            live = set(projection)
+            continue
+        filter_columns = _get_filter_columns(operation)
+        if filter_columns is None:
+            # it may use any column
+            live = None
+        elif live is not None:
+            live |= filter_columns
+    return live
+
+
+class LazyFrame:
+    """
+    Record postprocess operations on a dataframe, to be optimized and executed by `collect()`.
+    All the postprocess functions are available as methods taking their parameters as keyword
+    arguments (e.g. `lazy_df.query(query="value > 10")`), as well as `select(columns)`.
+    """
+
+    def __init__(self, df: pd.DataFrame, operations: Optional[List[Operation]] = None) -> None:
+        self.df = df
+        self.operations = operations or []
+
+    def _then(self, operation: Operation) -> "LazyFrame":
+        return LazyFrame(self.df, [*self.operations, operation])
+
+    def __getattr__(self, name: str) -> Callable[..., "LazyFrame"]:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            _resolve_postprocess(name)
+        except ValueError as e:
+            raise AttributeError(name) from e
+
+        def record(**params: Any) -> "LazyFrame":
+            return self._then(_build_operation({"postprocess": name, **params}))
+
+        return record
+
+    def apply(self, steps: List[Dict[str, Any]]) -> "LazyFrame":
+        """Record a list of postprocess steps like `{"postprocess": "query", "query": "a > 1"}`"""
+        lazy_frame = self
+        for step in steps:
+            lazy_frame = lazy_frame._then(_build_operation(step))
+        return lazy_frame
+
+    def select(self, columns: List[str]) -> "LazyFrame":
+        """Keep only `columns`"""
+        return self._then(Operation("select", _select, {"columns": list(columns)}))
+
+    def _optimize(self) -> PostprocessPlan:
+        operations = _push_down_filters(self.operations)
+        required_columns = _get_required_columns(operations)
+        if required_columns is not None:
+            columns = [column for column in self.df.columns if column in required_columns]
+            if len(columns) < len(self.df.columns):
+                operations.insert(0, Operation("select", _select, {"columns": columns}))
+        return _build_plan(operations)
+
+    def explain(self) -> str:
+        """Describe the optimized execution plan"""
+        return self._optimize().explain()
+
+    def collect(self) -> pd.DataFrame:
+        """Execute the recorded operations and return the resulting dataframe"""
+        return self._optimize()(self.df)
@@ -1,15 +1,20 @@
-from typing import Optional
+from typing import Any, List, Optional, Union
 
 import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode, parse_dates
 
+
+@honor_execution_mode
 def predict_linear(
     df: pd.DataFrame,
     *,
     variable_column: str,
     target_column: str,
     input_format: Optional[str] = None,
+    group_cols: Union[str, List[str], None] = None,
 ) -> pd.DataFrame:
     """
     Compute the linear regression of a target_column from a variable_column
@@ -24,60 +29,66 @@ def predict_linear(
     https://towardsdatascience.com/linear-regression-from-scratch-cd0dee067f72
     *optional :*
     - `input_format` (*str*): format of the input values (by default let the parser detect it)
+    - `group_cols` (*list*): names of the columns identifying the series to predict
+      (one regression is computed per group)
     # return a dataframe with values (original & predicted), value_is_prediction == True where values
     # were predicted and lower_bound/higher_bound for confidence interval
     """
-    # Use only variable_column & target_column
-    df = df[[variable_column, target_column]]
-    original_variable_column = df[variable_column].tolist()
+    if isinstance(group_cols, str):
+        group_cols = [group_cols]
+    group_cols = group_cols or []
+    # Use only group_cols, variable_column & target_column
+    df = df[[*group_cols, variable_column, target_column]]
     # As we'll have dates as X variable we should make them ordinal to capture seasonality
     # For example in a date format with dd-mm-yyyy try to extract dayoftheyear (e.g 11/12/2020 is 346)
-    df[variable_column] = df[variable_column].apply(
-        lambda x: pd.to_datetime(x, dayfirst=True, format=input_format)
+    X = (
+        parse_dates(df[variable_column], format=input_format, dayfirst=True)
+        .dt.dayofyear.to_numpy()
+        .astype(float)
     )
-    df[variable_column] = df[variable_column].dt.dayofyear
+    Y = df[target_column].to_numpy(dtype=float, na_value=np.nan)
+    if group_cols:
+        groups = df.groupby(group_cols, sort=False, dropna=False).ngroup().to_numpy()
+    else:
+        groups = np.zeros(len(df), dtype=int)
+    n_groups = groups.max() + 1 if len(groups) else 0
 
-    # Get variables & targets to train the model
-    df_train = df[~df[target_column].isnull()]
-    # Get variables where targets need to be predicted
-    variables_for_prediction = df[df[target_column].isnull()][variable_column]
-    X = df_train[variable_column].values
-    Y = df_train[target_column].values
-    x_mean = np.mean(X)
-    y_mean = np.mean(Y)
-    numerator, denominator = 0, 0
-    n = len(X)
+    # Train a model per group on the lines with a target
+    is_train = ~np.isnan(Y)
+    train_groups = groups[is_train]
 
-    for i in range(n):
-        numerator += (X[i] - x_mean) * (Y[i] - y_mean)
-        denominator += (X[i] - x_mean) ** 2
-    # Compute coefficients
-    b1 = numerator / denominator
-    b0 = y_mean - (b1 * x_mean)
+    def sum_by_group(values: npt.NDArray[np.float64]) -> npt.NDArray[Any]:
+        return np.bincount(train_groups, weights=values[is_train], minlength=n_groups)
 
-    # Predictions
-    X_pred = variables_for_prediction.tolist()
-    target_predictions = [b0 + b1 * X_pred[i] for i in range(len(X_pred))]
+    with np.errstate(all="ignore"):
+        n = np.bincount(train_groups, minlength=n_groups)
+        x_mean = (sum_by_group(X) / n)[groups]
+        y_mean = (sum_by_group(Y) / n)[groups]
+        numerator = sum_by_group((X - x_mean) * (Y - y_mean))
+        denominator = sum_by_group((X - x_mean) ** 2)
+        # Compute coefficients
+        b1 = (numerator / denominator)[groups]
+        b0 = y_mean - b1 * x_mean
+        target_predictions = b0 + b1 * X
 
-    # For confidence interval:
-    # https://datascience.stackexchange.com/questions/41934/
-    # obtaining-a-confidence-interval-for-the-prediction-of-a-linear-regression
-    stdev = np.sqrt(sum(([b0 + b1 * X[i] for i in range(n)] - Y) ** 2) / (n - 2))
-    lower_bound = [target_predictions[i] - 1.96 * stdev for i in range(len(target_predictions))]
-    higher_bound = [target_predictions[i] + 1.96 * stdev for i in range(len(target_predictions))]
-    predicted = pd.DataFrame(
-        {
-            variable_column: variables_for_prediction.values,
-            target_column: target_predictions,
-            f"{target_column}_is_prediction": True,
-            f"{target_column}_lower_bound": lower_bound,
-            f"{target_column}_higher_bound": higher_bound,
-        }
-    )
-    final = pd.concat([df_train, predicted], axis=0)
-    final[variable_column] = original_variable_column
-    final[f"{target_column}_is_prediction"].fillna(False, inplace=True)
-    final[f"{target_column}_lower_bound"].fillna(final[target_column], inplace=True)
-    final[f"{target_column}_higher_bound"].fillna(final[target_column], inplace=True)
+        # For confidence interval:
+        # https://datascience.stackexchange.com/questions/41934/
+        # obtaining-a-confidence-interval-for-the-prediction-of-a-linear-regression
+        stdev = np.sqrt(sum_by_group((target_predictions - Y) ** 2) / (n - 2))[groups]
+
+    # The lines with a target followed by the predicted ones
+    train = df[is_train]
+    predicted = df[~is_train].reset_index(drop=True)
+    predicted[target_column] = target_predictions[~is_train]
+    predicted[f"{target_column}_is_prediction"] = True
+    predicted[f"{target_column}_lower_bound"] = predicted[target_column] - 1.96 * stdev[~is_train]
+    predicted[f"{target_column}_higher_bound"] = predicted[target_column] + 1.96 * stdev[~is_train]
+    final = pd.concat([train, predicted], axis=0)
+    # no chained inplace `fillna`, which doesn't update `final` with copy-on-write
+    final[f"{target_column}_is_prediction"] = final[f"{target_column}_is_prediction"].fillna(False)
+    for bound in ("lower_bound", "higher_bound"):
+        final[f"{target_column}_{bound}"] = final[f"{target_column}_{bound}"].fillna(
+            final[target_column]
+        )
 
     return final
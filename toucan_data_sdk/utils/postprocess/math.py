@@ -1,6 +1,23 @@
+import ast
 import logging
 import operator as _operator
-from typing import TYPE_CHECKING, Any, List, Optional, Sequence, Union
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+import numpy.typing as npt
+
+from toucan_data_sdk.utils.helpers import honor_execution_mode
 
 if TYPE_CHECKING:
     import pandas as pd
@@ -11,6 +28,22 @@ MATH_CHARACTERS = "()+-/*%."
 DEPRECATED_COLUMN_QUOTE_CHARS = ('"', "'")
 COLUMN_QUOTE_CHARS = ("`",)
 
+# Operators allowed in a formula, with the numpy ufunc used when all the columns are numeric
+# (None: the pandas operator is always used to keep its handling of divisions by zero)
+BINARY_OPERATORS: Dict[type, Tuple[Callable[[Any, Any], Any], Optional[np.ufunc]]] = {
+    ast.Add: (_operator.add, np.add),
+    ast.Sub: (_operator.sub, np.subtract),
+    ast.Mult: (_operator.mul, np.multiply),
+    ast.Div: (_operator.truediv, np.true_divide),
+    ast.FloorDiv: (_operator.floordiv, None),
+    ast.Mod: (_operator.mod, None),
+    ast.Pow: (_operator.pow, None),
+}
+UNARY_OPERATORS: Dict[type, Tuple[Callable[[Any], Any], Optional[np.ufunc]]] = {
+    ast.USub: (_operator.neg, np.negative),
+    ast.UAdd: (_operator.pos, np.positive),
+}
+
 
 def _basic_math_operation(
     df: "pd.DataFrame",
@@ -38,6 +71,7 @@ def _basic_math_operation(
     return df
 
 
+@honor_execution_mode
 def add(
     df: "pd.DataFrame",
     new_column: str,
@@ -50,6 +84,7 @@ def add(
     return _basic_math_operation(df, new_column, column_1, column_2, op="add")
 
 
+@honor_execution_mode
 def subtract(
     df: "pd.DataFrame",
     new_column: str,
@@ -62,6 +97,7 @@ def subtract(
     return _basic_math_operation(df, new_column, column_1, column_2, op="sub")
 
 
+@honor_execution_mode
 def multiply(
     df: "pd.DataFrame",
     new_column: str,
@@ -74,6 +110,7 @@ def multiply(
     return _basic_math_operation(df, new_column, column_1, column_2, op="mul")
 
 
+@honor_execution_mode
 def divide(
     df: "pd.DataFrame",
     new_column: str,
@@ -160,6 +197,7 @@ def get_new_syntax_formula(formula: str) -> str:
     return "".join(t.get_text() for t in tokens)
 
 
+@honor_execution_mode
 def formula(df: "pd.DataFrame", *, new_column: str, formula: str) -> "pd.DataFrame":
     """
     Do mathematic operations on columns (add, subtract, multiply or divide)
@@ -238,26 +276,142 @@ def formula(df: "pd.DataFrame", *, new_column: str, formula: str) -> "pd.DataFra
             f"DEPRECATED: You should always use ` for your columns. "
             f"Old syntax: {old_formula!r}, new syntax: {formula!r}"
         )
-    tokens = _parse_formula(formula)
+    compiled_formula = _compile_formula(formula)
+    df[new_column] = compiled_formula.evaluate(df)
+    return df
+
+
+class CompiledFormula:
+    """
+    A formula parsed once into a python expression tree, where the columns are replaced by
+    the names `_0`, `_1`...
+    Only numbers, columns, parentheses and arithmetic operators are allowed.
+
+    When all the columns used are numeric, the formula is evaluated on their numpy arrays and
+    the intermediate results are reused to store the next ones, instead of allocating a new
+    Series for each operation.
+    """
+
+    def __init__(self, formula: str, columns: List[str], expression: str) -> None:
+        self.formula = formula
+        self.columns = columns
+        self.tree: Optional[ast.expr] = None
+        try:
+            tree = ast.parse(expression.strip(), mode="eval").body
+        except SyntaxError:
+            return
+        if self._is_valid(tree):
+            self.tree = tree
+
+    def _is_valid(self, node: ast.expr) -> bool:
+        if isinstance(node, ast.Constant):
+            return isinstance(node.value, (int, float)) and not isinstance(node.value, bool)
+        if isinstance(node, ast.Name):
+            return node.id.startswith("_") and node.id[1:].isdigit()
+        if isinstance(node, ast.UnaryOp):
+            return type(node.op) in UNARY_OPERATORS and self._is_valid(node.operand)
+        if isinstance(node, ast.BinOp):
+            return (
+                type(node.op) in BINARY_OPERATORS
+                and self._is_valid(node.left)
+                and self._is_valid(node.right)
+            )
+        return False
+
+    def _uses_only_ufuncs(self, node: ast.expr) -> bool:
+        if isinstance(node, ast.UnaryOp):
+            return self._uses_only_ufuncs(node.operand)
+        if isinstance(node, ast.BinOp):
+            return (
+                BINARY_OPERATORS[type(node.op)][1] is not None
+                and self._uses_only_ufuncs(node.left)
+                and self._uses_only_ufuncs(node.right)
+            )
+        return True
+
+    def evaluate(self, df: "pd.DataFrame") -> Any:
+        for column in self.columns:
+            if column not in df.columns:
+                raise FormulaError(f'"{column}" is not a valid column name')
+        if self.tree is None:
+            raise FormulaError(f"{self.formula!r} is not a valid formula")
+
+        series = [df[column] for column in self.columns]
+        if self._uses_only_ufuncs(self.tree) and all(
+            isinstance(s.dtype, np.dtype) and s.dtype.kind in "iuf" for s in series
+        ):
+            with np.errstate(all="ignore"):
+                result, is_temporary = _evaluate_with_ufuncs(
+                    self.tree, [s.to_numpy() for s in series]
+                )
+            # don't share the data of a column
+            return result if is_temporary else np.copy(result)
+        return _evaluate(self.tree, series)
+
+
+def _evaluate(node: ast.expr, columns: List[Any]) -> Any:
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Name):
+        return columns[int(node.id[1:])]
+    if isinstance(node, ast.UnaryOp):
+        return UNARY_OPERATORS[type(node.op)][0](_evaluate(node.operand, columns))
+    assert isinstance(node, ast.BinOp)
+    operator = BINARY_OPERATORS[type(node.op)][0]
+    return operator(_evaluate(node.left, columns), _evaluate(node.right, columns))
+
+
+def _evaluate_with_ufuncs(node: ast.expr, columns: List[npt.NDArray[Any]]) -> Tuple[Any, bool]:
+    """Returns the result and whether it is an intermediate array which can be overwritten"""
+    if isinstance(node, ast.Constant):
+        return node.value, False
+    if isinstance(node, ast.Name):
+        return columns[int(node.id[1:])], False
+    if isinstance(node, ast.UnaryOp):
+        unary_operator, unary_ufunc = UNARY_OPERATORS[type(node.op)]
+        operand, is_temporary = _evaluate_with_ufuncs(node.operand, columns)
+        if is_temporary:
+            assert unary_ufunc is not None
+            return unary_ufunc(operand, out=operand), True
+        return unary_operator(operand), isinstance(operand, np.ndarray)
+
+    assert isinstance(node, ast.BinOp)
+    operator, ufunc = BINARY_OPERATORS[type(node.op)]
+    left, is_left_temporary = _evaluate_with_ufuncs(node.left, columns)
+    right, is_right_temporary = _evaluate_with_ufuncs(node.right, columns)
+    if not isinstance(left, np.ndarray) and not isinstance(right, np.ndarray):
+        return operator(left, right), False
+    assert ufunc is not None
+    result_dtype = np.result_type(left, right)
+    # (a division of integers returns floats)
+    can_overwrite = ufunc is not np.true_divide or result_dtype.kind == "f"
+    for operand, is_temporary in ((left, is_left_temporary), (right, is_right_temporary)):
+        if can_overwrite and is_temporary and operand.dtype == result_dtype:
+            return ufunc(left, right, out=operand), True
+    return ufunc(left, right), True
+
+
+@lru_cache(maxsize=1024)
+def _compile_formula(formula: str) -> CompiledFormula:
+    columns: List[str] = []
     expression_splitted = []
-    for t in tokens:
+    for t in _parse_formula(formula):
         # To use a column name with only digits, it has to be quoted!
         # Otherwise it is considered as a regular number
         if not t.quoted and (t.text in MATH_CHARACTERS or is_float(t.text)):
             expression_splitted.append(t.text)
-        elif t.text in df.columns:
-            expression_splitted.append(f'df["{t.text}"]')
         else:
-            raise FormulaError(f'"{t.text}" is not a valid column name')
-    expression = "".join(expression_splitted)
-    df[new_column] = eval(expression)
-    return df
+            if t.text not in columns:
+                columns.append(t.text)
+            expression_splitted.append(f" _{columns.index(t.text)} ")
+    return CompiledFormula(formula, columns, "".join(expression_splitted))
 
 
 class FormulaError(Exception):
     """Raised when a formula is not valid"""
 
 
+@honor_execution_mode
 def round_values(
     df: "pd.DataFrame", *, column: str, decimals: int, new_column: Optional[str] = None
 ) -> "pd.DataFrame":
@@ -306,6 +460,7 @@ def round_values(
     return df
 
 
+@honor_execution_mode
 def absolute_values(
     df: "pd.DataFrame", *, column: str, new_column: Optional[str] = None
 ) -> "pd.DataFrame":
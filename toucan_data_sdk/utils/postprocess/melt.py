@@ -2,7 +2,10 @@ from typing import List
 
 import pandas as pd
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode
 
+
+@honor_execution_mode
 def melt(df: pd.DataFrame, id: List[str], value: List[str], dropna: bool = False) -> pd.DataFrame:
     """
     A melt will transform a dataset by creating a column "variable" and a column "value".
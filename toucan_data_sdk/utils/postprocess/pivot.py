@@ -3,9 +3,14 @@ from typing import List, Optional
 import numpy as np
 import pandas as pd
 
-from toucan_data_sdk.utils.helpers import get_temp_column_name
+from toucan_data_sdk.utils.helpers import (
+    copy_if_needed,
+    get_temp_column_name,
+    honor_execution_mode,
+)
 
 
+@honor_execution_mode
 def pivot(
     df: pd.DataFrame,
     index: List[str],
@@ -71,6 +76,7 @@ def pivot(
     return df
 
 
+@honor_execution_mode
 def pivot_by_group(df, variable, value, new_columns, groups, id_cols=None):
     """
     Pivot a dataframe by group of variables
@@ -121,7 +127,7 @@ def pivot_by_group(df, variable, value, new_columns, groups, id_cols=None):
     |   A  |   Group 2  |    6    |    0.2    |
 
     """
-    df = df.copy()
+    df = copy_if_needed(df)
 
     if id_cols is None:
         index = [variable]
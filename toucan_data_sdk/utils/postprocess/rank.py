@@ -2,10 +2,13 @@ from typing import TYPE_CHECKING, List, Optional, Union
 
 import numpy as np
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode
+
 if TYPE_CHECKING:
     import pandas as pd
 
 
+@honor_execution_mode
 def rank(
     df: "pd.DataFrame",
     value_cols: Union[str, List[str]],
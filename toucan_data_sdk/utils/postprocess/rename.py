@@ -1,5 +1,7 @@
 from typing import TYPE_CHECKING, Dict, Optional
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode
+
 if TYPE_CHECKING:
     import pandas as pd
 
@@ -23,6 +25,7 @@ def _safe_translate(
     return default
 
 
+@honor_execution_mode
 def rename(
     df: "pd.DataFrame",
     values: Optional[Dict[str, Dict[str, str]]] = None,
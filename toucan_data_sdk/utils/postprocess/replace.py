@@ -1,9 +1,12 @@
 from typing import TYPE_CHECKING, Any, Optional
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode
+
 if TYPE_CHECKING:
     import pandas as pd
 
 
+@honor_execution_mode
 def replace(
     df: "pd.DataFrame", column: str, new_column: Optional[str] = None, **kwargs: Any
 ) -> "pd.DataFrame":
@@ -1,9 +1,12 @@
 from typing import TYPE_CHECKING, List, Union
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode
+
 if TYPE_CHECKING:
     import pandas as pd
 
 
+@honor_execution_mode
 def sort(
     df: "pd.DataFrame", columns: Union[str, List[str]], order: Union[str, List[str]] = "asc"
 ) -> "pd.DataFrame":
@@ -3,6 +3,8 @@ from typing import Any, Callable, List, Optional
 import numpy as np
 import pandas as pd
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode
+
 __all__ = (
     "lower",
     "upper",
@@ -59,6 +61,7 @@ __all__ = (
 def _generate_basic_str_postprocess(
     method_name: str, docstring: str
 ) -> Callable[[pd.DataFrame, str, Optional[str]], pd.DataFrame]:
+    @honor_execution_mode
     def f(df: pd.DataFrame, column: str, new_column: Optional[str] = None) -> pd.DataFrame:
         method = getattr(df[column].str, method_name)
         new_column = new_column or column
@@ -152,6 +155,7 @@ isdecimal = _generate_basic_str_postprocess("isdecimal", doc)
 def _generate_strip_str_postprocess(
     method_name: str, docstring: str
 ) -> Callable[[pd.DataFrame, str, Optional[str], Optional[str]], pd.DataFrame]:
+    @honor_execution_mode
     def f(
         df: pd.DataFrame,
         column: str,
@@ -210,6 +214,7 @@ rstrip = _generate_strip_str_postprocess("rstrip", doc)
 def _generate_width_str_postprocess(
     method_name: str, docstring: str
 ) -> Callable[[pd.DataFrame, str, int, str, Optional[str]], pd.DataFrame]:
+    @honor_execution_mode
     def f(
         df: pd.DataFrame,
         column: str,
@@ -269,6 +274,7 @@ rjust = _generate_width_str_postprocess("rjust", doc)
 def _generate_split_str_postprocess(
     method_name: str, docstring: str
 ) -> Callable[[pd.DataFrame, str, Optional[List[str]], str, Optional[int]], pd.DataFrame]:
+    @honor_execution_mode
     def f(
         df: pd.DataFrame,
         column: str,
@@ -331,6 +337,7 @@ rsplit = _generate_split_str_postprocess("rsplit", doc)
 def _generate_partition_str_postprocess(
     method_name: str, docstring: str
 ) -> Callable[[pd.DataFrame, str, List[str], str], pd.DataFrame]:
+    @honor_execution_mode
     def f(df: pd.DataFrame, column: str, *, new_columns: List[str], sep: str = " ") -> pd.DataFrame:
         if len(new_columns) != 3:
             raise ValueError("`new_columns` must have 3 columns exactly")
@@ -390,6 +397,7 @@ rpartition = _generate_partition_str_postprocess("rpartition", doc)
 def _generate_find_str_postprocess(
     method_name: str, docstring: str
 ) -> Callable[[pd.DataFrame, str, str, int, Optional[int], Optional[str]], pd.DataFrame]:
+    @honor_execution_mode
     def f(
         df: pd.DataFrame,
         column: str,
@@ -467,6 +475,7 @@ rindex = _generate_find_str_postprocess("rindex", doc)
 def _generate_with_str_postprocess(
     method_name: str, docstring: str
 ) -> Callable[[pd.DataFrame, str, str, Any, Optional[str]], pd.DataFrame]:
+    @honor_execution_mode
     def f(
         df: pd.DataFrame,
         column: str,
@@ -520,6 +529,7 @@ endswith = _generate_with_str_postprocess("endswith", doc)
 ###################################################################################################
 #                                        OTHER METHODS
 ###################################################################################################
+@honor_execution_mode
 def concat(
     df: pd.DataFrame, *, columns: List[str], new_column: str, sep: Optional[str] = None
 ) -> pd.DataFrame:
@@ -562,6 +572,7 @@ def concat(
     return df
 
 
+@honor_execution_mode
 def contains(
     df: pd.DataFrame,
     column: str,
@@ -596,6 +607,7 @@ def contains(
     return df
 
 
+@honor_execution_mode
 def repeat(
     df: pd.DataFrame, column: str, *, times: int, new_column: Optional[str] = None
 ) -> pd.DataFrame:
@@ -620,6 +632,7 @@ def repeat(
     return df
 
 
+@honor_execution_mode
 def replace_pattern(
     df: pd.DataFrame,
     column: str,
@@ -1,10 +1,23 @@
 from typing import List, Optional, Union
 
+import numpy as np
 import pandas as pd
-
-from toucan_data_sdk.utils.helpers import get_temp_column_name
-
-
+from pandas.api.types import (
+    is_complex_dtype,
+    is_datetime64_any_dtype,
+    is_numeric_dtype,
+    is_period_dtype,
+    is_timedelta64_dtype,
+)
+
+from toucan_data_sdk.utils.helpers import (
+    get_temp_column_name,
+    honor_execution_mode,
+    parse_dates,
+)
+
+
+@honor_execution_mode
 def top(
     df: pd.DataFrame,
     value: str,
@@ -66,27 +79,43 @@ def top(
     |   lala   |    2     |  350  |
     |   lala   |    2     |  450  |
     """
-    ascending = order != "desc"
     limit = int(limit)
-    filter_func = "nlargest" if (limit > 0) ^ ascending else "nsmallest"
-    sorted_order = 1 if limit > 0 else -1
-    df = df.copy()
-
-    def _top(df: pd.DataFrame) -> pd.DataFrame:
-        try:
-            df = getattr(df, filter_func)(abs(limit), value)
-        except TypeError:
-            # Create a temporay column and make sure the name is not already taken
-            temp_column = get_temp_column_name(df)
-            # Fallback on dtype: object -> try to convert to datetime
-            df[temp_column] = pd.to_datetime(df[value], format=date_format)
-            df = getattr(df, filter_func)(abs(limit), temp_column)
-            del df[temp_column]
-        return df[::sorted_order]
-
-    return _top(df) if group is None else df.groupby(group).apply(_top).reset_index(drop=True)
-
-
+    n = abs(limit)
+    values = df[value]
+    if not _is_orderable(values):
+        # Fallback on dtype: object -> try to convert to datetime
+        values = parse_dates(values, format=date_format)
+
+    # Positions of the rows from the first to the last value to keep: like `nlargest` and
+    # `nsmallest`, the sort is stable (ties are kept in order of appearance), nulls are last
+    ascending = (limit > 0) ^ (order == "desc")
+    positions = (
+        values.reset_index(drop=True).sort_values(ascending=ascending, kind="mergesort").index
+    )
+    if group is None:
+        return df.iloc[positions[:n][:: 1 if limit > 0 else -1]]
+
+    # Keep the first `n` rows of each group, then sort them by group
+    group_cols = [group] if isinstance(group, str) else list(group)
+    keys = df[group_cols].iloc[positions].reset_index(drop=True)
+    rank_column = get_temp_column_name(keys)
+    keys[rank_column] = keys.groupby(group_cols, sort=False).cumcount()
+    keys = keys[(keys[rank_column] < n) & keys[group_cols].notna().all(axis=1)]
+    keys = keys.sort_values(
+        [*group_cols, rank_column], ascending=[True] * len(group_cols) + [limit > 0]
+    )
+    return df.iloc[positions[keys.index]].reset_index(drop=True)
+
+
+def _is_orderable(values: pd.Series) -> bool:
+    """Whether `values` can be sorted with `nlargest` and `nsmallest`"""
+    return (is_numeric_dtype(values) and not is_complex_dtype(values)) or any(
+        is_dtype(values)
+        for is_dtype in (is_datetime64_any_dtype, is_timedelta64_dtype, is_period_dtype)
+    )
+
+
+@honor_execution_mode
 def top_group(
     df: pd.DataFrame,
     aggregate_by: List[str],
@@ -162,7 +191,15 @@ def top_group(
     if isinstance(group, str):
         group = [group]
     group_top: List[str] = group or []
-    df2 = df.groupby(group_top + aggregate_by).agg(function).reset_index()
-    df2 = top(df2, group=group, value=value, limit=limit, order=order).reset_index(drop=True)
-    df2 = df2[group_top + aggregate_by]
-    return df2.merge(df, on=group_top + aggregate_by)
+    keys = group_top + aggregate_by
+    df2 = df.groupby(keys)[value].agg(function).reset_index()
+    df2 = top(df2, group=group, value=value, limit=limit, order=order)
+
+    # Keep the rows of `df` belonging to the top groups, in the order of the top groups
+    # (without merging them back on `df`, which hashes and copies all its rows)
+    top_keys = pd.MultiIndex.from_frame(df2[keys])
+    positions = top_keys.get_indexer(pd.MultiIndex.from_frame(df[keys]))
+    kept = np.flatnonzero(positions >= 0)
+    kept = kept[np.argsort(positions[kept], kind="mergesort")]
+    columns = keys + [c for c in df.columns if c not in keys]
+    return df.iloc[kept][columns].reset_index(drop=True)
@@ -1,7 +1,10 @@
 from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, TypedDict, Union
 
+import numpy as np
 import pandas as pd
 
+from toucan_data_sdk.utils.helpers import honor_execution_mode
+
 if TYPE_CHECKING:
     from typing_extensions import NotRequired
 
@@ -15,6 +18,7 @@ if TYPE_CHECKING:
         groupsOrder: NotRequired[List[str]]
 
 
+@honor_execution_mode
 def waterfall(
     df: pd.DataFrame,
     date: str,
@@ -108,22 +112,16 @@ def waterfall(
     if len(df) == 0:
         return df
 
-    if filters is not None:
-        if isinstance(filters, str):
-            filters = [filters]
-
-        def sub_waterfall(df: pd.DataFrame) -> pd.DataFrame:
-            wa_df = waterfall(df, date, value, start, end, upperGroup, insideGroup)
-            for filters_col in filters:  # type: ignore[union-attr]
-                wa_df[filters_col] = df[filters_col].values[0]
-            return wa_df
-
-        # filters df into a list of sub_df
-        list_of_sub_df = [
-            df[(df[filters].values == i).all(axis=1)] for i in df[filters].drop_duplicates().values
-        ]
-
-        return pd.concat([sub_waterfall(df) for df in list_of_sub_df], sort=False)
+    if filters is None:
+        filters = []
+    elif isinstance(filters, str):
+        filters = [filters]
+    # the waterfall is computed for each combination of the filters (in order of appearance),
+    # by adding the filters to the keys of all the groupbys
+    if filters:
+        combinations = df[filters].drop_duplicates().reset_index(drop=True)
+    else:
+        combinations = pd.DataFrame(index=[0])
 
     groups = {
         "upperGroup": {
@@ -149,17 +147,17 @@ def waterfall(
     agg_conf = {"value": "sum"}
     agg_conf.update({f"{col}_label": "first" for col in groups.keys()})
     agg_conf.update({f"{col}_order": "first" for col in groups.keys()})
-    df = df.groupby(list(groups.keys()) + ["date"]).agg(agg_conf).reset_index()
+    df = df.groupby(filters + list(groups.keys()) + ["date"]).agg(agg_conf).reset_index()
 
-    df_start, df_end = _compute_start_end(df, start, end)
+    df_start, df_end = _compute_start_end(df, start, end, combinations)
 
-    df = _compute_value_diff(df, start, end, groups)
+    df = _compute_value_diff(df, start, end, groups, filters)
 
-    middle = _compute_upper_group(df)
+    middle = _compute_upper_group(df, filters)
     if insideGroup is not None:
         middle = pd.concat([middle, _compute_inside_group(df)])
 
-    ret = _compute_order(df_start, df_end, middle, groups)
+    ret = _compute_order(df_start, df_end, middle, groups, combinations)
 
     return ret
 
@@ -175,39 +173,48 @@ def _compute_rename(
         else:
             df.rename(columns={g["obj"]["label"]: f"{g_name}_label"}, inplace=True)
         if "groupsOrder" not in g["obj"]:
-            df[f"{g_name}_order"] = pd.np.nan
+            df[f"{g_name}_order"] = np.nan
         else:
             df.rename(columns={g["obj"]["groupsOrder"]: f"{g_name}_order"}, inplace=True)
     return df
 
 
 def _compute_start_end(
-    df: pd.DataFrame, start: "DateConfig", end: "DateConfig"
+    df: pd.DataFrame, start: "DateConfig", end: "DateConfig", combinations: pd.DataFrame
 ) -> Tuple[pd.DataFrame, pd.DataFrame]:
     """
     Compute two dataframes with value for start and end
     Args:
         totals(dataframe):
+        combinations(dataframe): combinations of the filters (one line per waterfall)
 
     Returns: Dataframe, Dataframe
 
     """
     result = {}
     time_dict = {"start": start, "end": end}
-    totals = df.groupby("date").agg({"value": sum}).reset_index()
+    filters = list(combinations.columns)
+    totals = df.groupby(filters + ["date"]).agg({"value": sum}).reset_index()
     for time_name, time in time_dict.items():
-        if not totals[totals["date"] == time["id"]].empty:
-            value = totals.loc[totals["date"] == time["id"], "value"].values[0]
+        time_totals = totals.loc[totals["date"] == time["id"], filters + ["value"]]
+        if filters:
+            value = combinations.merge(time_totals, on=filters, how="left")["value"].fillna(0)
         else:
-            value = 0
+            value = time_totals["value"].sum()
         result[time_name] = pd.DataFrame(
-            [{"value": value, "label": time["label"], "groups": time["label"]}]
+            {"value": value, "label": time["label"], "groups": time["label"]},
+            index=combinations.index,
         )
+        result[time_name][filters] = combinations
     return result["start"], result["end"]
 
 
 def _compute_value_diff(
-    df: pd.DataFrame, start: "DateConfig", end: "DateConfig", groups: Dict[str, Dict[str, Any]]
+    df: pd.DataFrame,
+    start: "DateConfig",
+    end: "DateConfig",
+    groups: Dict[str, Dict[str, Any]],
+    filters: List[str],
 ) -> pd.DataFrame:
     """
     Compute diff value between start and end
@@ -220,7 +227,7 @@ def _compute_value_diff(
     start_values = df[df["date"] == start["id"]].copy()
     end_values = df[df["date"] == end["id"]].copy()
 
-    merge_on: List[str] = []
+    merge_on: List[str] = list(filters)
     for key, group in groups.items():
         merge_on = merge_on + [key, f"{key}_label", f"{key}_order"]
 
@@ -251,7 +258,7 @@ def _compute_inside_group(df: pd.DataFrame) -> pd.DataFrame:
     return inside_group
 
 
-def _compute_upper_group(df: pd.DataFrame) -> pd.DataFrame:
+def _compute_upper_group(df: pd.DataFrame, filters: List[str]) -> pd.DataFrame:
     """
     Compute upperGroup
     Args:
@@ -261,7 +268,7 @@ def _compute_upper_group(df: pd.DataFrame) -> pd.DataFrame:
 
     """
     upper_group = (
-        df.groupby(["groups"])
+        df.groupby(filters + ["groups"])
         .agg(
             {
                 "value": sum,
@@ -284,6 +291,7 @@ def _compute_order(
     df_end: pd.DataFrame,
     df_middle: pd.DataFrame,
     groups: Dict[str, Dict[str, Any]],
+    combinations: pd.DataFrame,
 ) -> pd.DataFrame:
     order: Dict[str, List[str]] = {"by": [], "ascending": []}
     for key, group in groups.items():
@@ -298,4 +306,14 @@ def _compute_order(
         cond = ret["type"] == elt["type"]
         ret.loc[cond, "order"] = ret.loc[cond, f"{key}_order"]
         ret.drop([f"{key}_order"], axis=1, inplace=True)
-    return ret
+
+    filters = list(combinations.columns)
+    if not filters:
+        return ret
+    # Put the lines of each waterfall together: start, middle (sorted) and end
+    combination_ranks = pd.MultiIndex.from_frame(combinations).get_indexer(
+        pd.MultiIndex.from_frame(ret[filters])
+    )
+    parts = np.repeat([0, 1, 2], [len(df_start), len(df_middle), len(df_end)])
+    ret = ret.iloc[np.lexsort((parts, combination_ranks))]
+    return ret[[c for c in ret.columns if c not in filters] + filters]
@@ -0,0 +1,220 @@
+"""
+Low-overhead tracing of pipeline steps: a single `trace` decorator instead of stacking
+`log_shapes`, `log_message` and `log_time`.
+
+When tracing is enabled (see `tracing()`), each call of a decorated function records a span with:
+ - its wall time (`time.perf_counter_ns`) and CPU time (`time.thread_time_ns`),
+ - the shapes of its input and output dataframes,
+ - the variation of the memory used by the process (RSS),
+ - the spans of the decorated functions it calls (children).
+
+When tracing is disabled, the decorated function is called directly.
+
+Examples:
+
+    # augment.py
+    from toucan_data_sdk.utils.tracing import trace
+
+    @trace
+    def parse_reseau(df):
+        # Do transformations
+        return df
+
+    @trace(name="augment")
+    def main(dfs):
+        dfs["reseau"] = parse_reseau(dfs["reseau"])
+        return dfs
+
+    # notebook
+    from toucan_data_sdk.utils.tracing import tracing, write_chrome_trace
+
+    with tracing() as spans:
+        main(dfs)
+    # to open in chrome://tracing or https://ui.perfetto.dev
+    write_chrome_trace(spans, "augment_trace.json")
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, Callable, Dict, Generator, List, Optional, Tuple
+
+import pandas as pd
+
+from .helpers import get_rss
+
+# Root spans of the current tracing session (None when tracing is disabled)
+_spans: Optional[List["Span"]] = None
+_spans_lock = threading.Lock()
+# Stack of the spans being recorded, by thread
+_local = threading.local()
+
+
+@dataclass
+class Span:
+    """Record of one call of a traced function (times are in nanoseconds, memory in bytes)"""
+
+    name: str
+    thread_id: int
+    start_ns: int = 0
+    end_ns: int = 0
+    cpu_time_ns: int = 0
+    memory_delta: int = 0
+    input_shapes: List[Tuple[int, int]] = field(default_factory=list)
+    output_shapes: List[Tuple[int, int]] = field(default_factory=list)
+    error: Optional[str] = None
+    children: List["Span"] = field(default_factory=list)
+
+    @property
+    def duration_ns(self) -> int:
+        return self.end_ns - self.start_ns
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "duration_ms": self.duration_ns / 1e6,
+            "cpu_time_ms": self.cpu_time_ns / 1e6,
+            "memory_delta": self.memory_delta,
+            "input_shapes": self.input_shapes,
+            "output_shapes": self.output_shapes,
+            "error": self.error,
+            "children": [child.to_dict() for child in self.children],
+        }
+
+
+def _get_shapes(*values: Any) -> List[Tuple[int, int]]:
+    """Shapes of the dataframes in `values`, also looking into dicts (e.g. `dfs`), lists and tuples"""
+    shapes = []
+    for value in values:
+        if isinstance(value, pd.DataFrame):
+            shapes.append(value.shape)
+            continue
+        if isinstance(value, dict):
+            value = value.values()
+        elif not isinstance(value, (list, tuple)):
+            continue
+        shapes += [df.shape for df in value if isinstance(df, pd.DataFrame)]
+    return shapes
+
+
+def _get_stack() -> List[Span]:
+    try:
+        return _local.stack  # type: ignore[no-any-return]
+    except AttributeError:
+        _local.stack = []
+        return _local.stack  # type: ignore[no-any-return]
+
+
+def _traced_call(
+    func: Callable[..., Any], name: str, args: Tuple[Any, ...], kwargs: Dict[str, Any]
+) -> Any:
+    root_spans = _spans
+    stack = _get_stack()
+    span = Span(
+        name,
+        thread_id=threading.get_ident(),
+        input_shapes=_get_shapes(*args, *kwargs.values()),
+    )
+    rss_start = get_rss()
+    stack.append(span)
+    cpu_start = time.thread_time_ns()
+    span.start_ns = time.perf_counter_ns()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as e:
+        span.error = repr(e)
+        raise
+    finally:
+        span.end_ns = time.perf_counter_ns()
+        span.cpu_time_ns = time.thread_time_ns() - cpu_start
+        span.memory_delta = get_rss() - rss_start
+        stack.pop()
+        if stack:
+            stack[-1].children.append(span)
+        elif root_spans is not None:
+            with _spans_lock:
+                root_spans.append(span)
+    span.output_shapes = _get_shapes(result)
+    return result
+
+
+def trace(
+    func: Optional[Callable[..., Any]] = None, *, name: Optional[str] = None
+) -> Callable[..., Any]:
+    """
+    Decorator recording a span for each call of the function when tracing is enabled.
+    Can be used as:
+    - @trace
+    - @trace(name="my step")
+    """
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if _spans is None:
+                return func(*args, **kwargs)
+            return _traced_call(func, span_name, args, kwargs)
+
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+@contextmanager
+def tracing() -> Generator[List[Span], None, None]:
+    """Enable tracing inside the context and collect the root spans in the yielded list"""
+    global _spans
+    previous_spans = _spans
+    _spans = []
+    try:
+        yield _spans
+    finally:
+        _spans = previous_spans
+
+
+def spans_to_json(spans: List[Span], **kwargs: Any) -> str:
+    """Export the span tree as JSON (extra kwargs are passed to `json.dumps`)"""
+    return json.dumps([span.to_dict() for span in spans], **kwargs)
+
+
+def spans_to_chrome_trace(spans: List[Span]) -> Dict[str, Any]:
+    """Export the spans in the Chrome trace event format (complete events, times in µs)"""
+    pid = os.getpid()
+    events = []
+
+    def add_events(span: Span) -> None:
+        events.append(
+            {
+                "name": span.name,
+                "ph": "X",
+                "ts": span.start_ns / 1000,
+                "dur": span.duration_ns / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {
+                    "cpu_time_ms": span.cpu_time_ns / 1e6,
+                    "memory_delta": span.memory_delta,
+                    "input_shapes": span.input_shapes,
+                    "output_shapes": span.output_shapes,
+                    "error": span.error,
+                },
+            }
+        )
+        for child in span.children:
+            add_events(child)
+
+    for span in spans:
+        add_events(span)
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def write_chrome_trace(spans: List[Span], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(spans_to_chrome_trace(spans), f)